@@ -1,495 +1,156 @@
-import streamlit as st
-import pandas as pd
-import pdfplumber
-import re
-from io import BytesIO
 import datetime
+import hashlib
 
-def parse_members(uploaded_file):
-    """Parse members and optional availability notes from the Excel file.
-
-    Column A (from row 3) contains names.
-    Column B (optional) contains notes such as 'Sunday only'.
-    """
-    df = pd.read_excel(uploaded_file, header=None)
+import streamlit as st
+import pandas as pd
 
-    name_series = df.iloc[2:, 0]
-    notes_series = df.iloc[2:, 1] if df.shape[1] > 1 else None
+from modevaert import (
+    WEEKEND, AvailabilityMatrix, HostingLedger, Instrumentation, PageTextCache, ProgramParse,
+    SchedulingConstraints, ScheduleStore, ScheduleTable, create_csv, create_parquet, create_xlsx,
+    enable_json_logging, generate_schedule, parse_members, score_schedule, search_schedules,
+    update_schedule
+)
 
-    members = []
-    availability = {}  # name -> availability flag, e.g. 'sunday_only'
+# One JSON line per run with stage timings and per-PDF counters, for the server logs
+enable_json_logging()
 
-    for idx, name in name_series.items():
-        if pd.isna(name):
-            continue
-        name_str = str(name).strip()
-        if not name_str:
-            continue
+@st.cache_resource
+def get_page_text_cache():
+    return PageTextCache()
 
-        members.append(name_str)
+@st.cache_resource
+def get_schedule_store():
+    return ScheduleStore()
 
-        note_flag = None
-        if notes_series is not None:
-            note_val = notes_series.get(idx)
-            if isinstance(note_val, str):
-                normalized_note = note_val.strip().lower()
-                if normalized_note == "sunday only":
-                    note_flag = "sunday_only"
+@st.cache_resource
+def get_hosting_ledger():
+    return HostingLedger()
 
-        if note_flag:
-            availability[name_str] = note_flag
+def file_key(uploaded_file):
+    return hashlib.sha256(uploaded_file.getvalue()).hexdigest()
 
-    return members, availability
+def memoized(run, stage, key, compute):
+    """Return compute()'s value, recomputed (and timed as a stage of run) only when key changed.
 
-def normalize_name(name):
-    """Normalize a name for comparison by removing extra spaces and converting to lowercase"""
-    return ' '.join(name.split()).lower()
+    Streamlit reruns the whole script on every widget interaction. Each stage
+    keeps its last key and value in the session, and the key of every stage
+    includes the keys of the stages it depends on, so a rerun only recomputes
+    the stages whose inputs changed.
+    """
+    memo = st.session_state.setdefault('stage_memo', {})
+    if stage in memo and memo[stage][0] == key:
+        _, value, record = memo[stage]
+        run.stages.append(dict(record, reused=True))
+        return value
+    with run.stage(stage):
+        value = compute()
+    run.stages[-1]['reused'] = False
+    memo[stage] = (key, value, run.stages[-1])
+    return value
 
-def find_matching_member(pdf_name, members_list):
-    """Find a matching member name from the members list, handling variations"""
-    normalized_pdf_name = normalize_name(pdf_name)
-    
-    # First try exact match
-    for member in members_list:
-        if normalize_name(member) == normalized_pdf_name:
-            return member
-    
-    # Try partial matches (e.g., "Michael Vollenberg Keler" matches "Michael Keler")
-    for member in members_list:
-        normalized_member = normalize_name(member)
-        # Check if the member name is contained in the PDF name or vice versa
-        if (normalized_member in normalized_pdf_name or 
-            normalized_pdf_name in normalized_member):
-            return member
-    
-    # Try matching by last name (most reliable for Danish names)
-    pdf_words = normalized_pdf_name.split()
-    for member in members_list:
-        normalized_member = normalize_name(member)
-        member_words = normalized_member.split()
-        
-        # Check if any word from PDF name matches any word from member name
-        for pdf_word in pdf_words:
-            for member_word in member_words:
-                if pdf_word == member_word and len(pdf_word) > 2:  # Avoid matching short words
-                    return member
-    
-    return None
+def parse_with_progress(key, uploaded_pdfs, members):
+    """Parse the programs on a background thread, showing progress and the meetings found so far.
 
-def calculate_weekday_in_range(start_day, end_day, month_name, year, target_weekday):
-    """
-    Calculate the date of a specific weekday within a date range.
-    target_weekday: 0=Monday, 1=Tuesday, ..., 6=Sunday
+    The parse is kept in the session under key, so a rerun while it runs
+    keeps waiting for the same parse. Returns (meetings, stats, file stats, fuzzy hits).
     """
-    month_order = {
-        'Januar': 1, 'Februar': 2, 'Marts': 3, 'April': 4, 'Maj': 5, 'Juni': 6,
-        'Juli': 7, 'August': 8, 'September': 9, 'Oktober': 10, 'November': 11, 'December': 12
-    }
-    
-    month_num = month_order.get(month_name, 1)
-    
-    # Find the target weekday in the range
-    for day in range(start_day, end_day + 1):
+    parse = st.session_state.get('program_parse')
+    if parse is None or parse[0] != key:
+        parse = (key, ProgramParse(uploaded_pdfs, members, cache=get_page_text_cache()).start())
+        st.session_state['program_parse'] = parse
+    job = parse[1]
+    with st.status(f"Indlæser {len(uploaded_pdfs)} mødeprogram(mer) …", expanded=True) as status:
+        progress = st.progress(0.0)
+        partial = st.empty()
+        shown = 0
         try:
-            date_obj = datetime.date(year, month_num, day)
-            if date_obj.weekday() == target_weekday:
-                return date_obj
-        except ValueError:
-            continue
-    return None
-
-def parse_program(uploaded_files, members_list):
-    all_meetings = {}
-    
-    for uploaded_file in uploaded_files:
-        with pdfplumber.open(uploaded_file) as pdf:
-            text = '\n'.join(page.extract_text() for page in pdf.pages if page.extract_text())
-        meetings = {}
-        current_date = None
-        current_weekend_date = None
-        assigned = set()
-        weekend_assigned = set()
-        in_weekend_section = False  # Track if we're in a weekend meeting section
-        lines = text.split('\n')
-        for line in lines:
-            line = line.strip()
-            
-            # Look for weekday meeting dates (e.g., "Tirsdag 15 September", "Torsdag 09 December")
-            weekday_date_match = re.match(r'(Tirsdag|Mandag|Torsdag) \d{2} (September|Oktober|November|December|Januar|Februar|Marts|April|Maj|Juni|Juli|August)', line)
-            
-            # Look for weekend meeting dates (e.g., "07/09/2025")
-            weekend_date_match = re.match(r'(\d{2})/(\d{2})/(\d{4})', line)
-            
-            # Look for January format dates (e.g., "06. JAN | UGENS BIBELLÆSNING: ESAJAS 17-20")
-            january_date_match = re.search(r'(\d{2})\.\s*JAN', line)
-            
-            # Look for other Danish date formats (e.g., "01 Januar 26", "01. Januar 26")
-            danish_date_match = re.search(r'(\d{2})\.?\s*(Januar|Februar|Marts|April|Maj|Juni|Juli|August|September|Oktober|November|December)', line)
-
-            # Look for abbreviated Danish month formats (e.g., "03. FEB", "10 FEB")
-            abbrev_date_match = re.search(
-                r'(\d{2})\.?\s*(JAN|FEB|MAR|APR|MAJ|JUN|JUL|AUG|SEP|OKT|NOV|DEC)',
-                line,
-                re.IGNORECASE
-            )
-            
-            # NEW: Look for date range format (e.g., "marts 02-08")
-            date_range_match = re.search(
-                r'(januar|februar|marts|april|maj|juni|juli|august|september|oktober|november|december)\s+(\d{1,2})-(\d{1,2})',
-                line,
-                re.IGNORECASE
-            )
-            
-            # NEW: Look for cross-month date range (e.g., "Marts 30-april 05")
-            cross_month_range_match = re.search(
-                r'(januar|februar|marts|april|maj|juni|juli|august|september|oktober|november|december)\s+(\d{1,2})-(januar|februar|marts|april|maj|juni|juli|august|september|oktober|november|december)\s+(\d{1,2})',
-                line,
-                re.IGNORECASE
+            while not job.wait(0.1):
+                progress.progress(
+                    job.fraction,
+                    text=f"{job.files_done} af {len(uploaded_pdfs)} PDF-fil(er), {sum(job.pages_done)} side(r) læst"
+                )
+                if job.files_done != shown:
+                    shown = job.files_done
+                    partial.dataframe(
+                        pd.DataFrame({
+                            'Dato': [meeting.label for meeting in job.meetings()],
+                            'Opgaver': [', '.join(sorted(meeting.assignees)) for meeting in job.meetings()],
+                        }),
+                        width='stretch',
+                        hide_index=True
+                    )
+            meetings = job.meetings()
+        except Exception as exc:
+            # job.meetings() re-raises the parse's error; forget the failed parse so the
+            # next rerun starts a new one instead of failing the same way
+            del st.session_state['program_parse']
+            status.update(label="Mødeprogrammerne kunne ikke indlæses", state='error', expanded=False)
+            error = exc
+        else:
+            del st.session_state['program_parse']
+            status.update(
+                label=f"{len(meetings)} møde(r) fundet i {len(uploaded_pdfs)} PDF-fil(er)",
+                state='complete', expanded=False
             )
-            
-            if cross_month_range_match:
-                # Handle cross-month ranges first (more specific)
-                if current_date:
-                    meetings[current_date] = assigned
-                if current_weekend_date:
-                    meetings[current_weekend_date] = weekend_assigned
-                
-                # Reset weekend section flag when we encounter a new date range
-                in_weekend_section = False
-                
-                start_month_str, start_day_str, end_month_str, end_day_str = cross_month_range_match.groups()
-                
-                # Capitalize month names
-                month_capitalize = {
-                    'januar': 'Januar', 'februar': 'Februar', 'marts': 'Marts', 'april': 'April',
-                    'maj': 'Maj', 'juni': 'Juni', 'juli': 'Juli', 'august': 'August',
-                    'september': 'September', 'oktober': 'Oktober', 'november': 'November', 'december': 'December'
-                }
-                start_month = month_capitalize.get(start_month_str.lower(), start_month_str)
-                end_month = month_capitalize.get(end_month_str.lower(), end_month_str)
-                
-                year = 2026
-                start_day = int(start_day_str)
-                end_day = int(end_day_str)
-                
-                # Calculate Tuesday in the range (1 = Tuesday)
-                tuesday_date = calculate_weekday_in_range(start_day, 31, start_month, year, 1)
-                if not tuesday_date:
-                    tuesday_date = calculate_weekday_in_range(1, end_day, end_month, year, 1)
-                
-                # Calculate Sunday in the range (6 = Sunday)
-                sunday_date = calculate_weekday_in_range(start_day, 31, start_month, year, 6)
-                if not sunday_date:
-                    sunday_date = calculate_weekday_in_range(1, end_day, end_month, year, 6)
-                
-                current_date = None
-                current_weekend_date = None
-                
-                if tuesday_date:
-                    month_order = {
-                        1: 'Januar', 2: 'Februar', 3: 'Marts', 4: 'April', 5: 'Maj', 6: 'Juni',
-                        7: 'Juli', 8: 'August', 9: 'September', 10: 'Oktober', 11: 'November', 12: 'December'
-                    }
-                    month_name = month_order[tuesday_date.month]
-                    current_date = f"Tirsdag {tuesday_date.day:02d} {month_name} {tuesday_date.year}"
-                    assigned = set()
-                
-                if sunday_date:
-                    month_order = {
-                        1: 'Januar', 2: 'Februar', 3: 'Marts', 4: 'April', 5: 'Maj', 6: 'Juni',
-                        7: 'Juli', 8: 'August', 9: 'September', 10: 'Oktober', 11: 'November', 12: 'December'
-                    }
-                    month_name = month_order[sunday_date.month]
-                    current_weekend_date = f"Søndag {sunday_date.day:02d} {month_name} {sunday_date.year}"
-                    weekend_assigned = set()
-                
-                if 'Intet møde' in line or 'Ingen møde' in line:
-                    current_date = None
-                    current_weekend_date = None
-                    continue
-            elif date_range_match:
-                # Handle single-month date ranges
-                if current_date:
-                    meetings[current_date] = assigned
-                if current_weekend_date:
-                    meetings[current_weekend_date] = weekend_assigned
-                
-                # Reset weekend section flag when we encounter a new date range
-                in_weekend_section = False
-                
-                month_str, start_day_str, end_day_str = date_range_match.groups()
-                
-                # Capitalize month names
-                month_capitalize = {
-                    'januar': 'Januar', 'februar': 'Februar', 'marts': 'Marts', 'april': 'April',
-                    'maj': 'Maj', 'juni': 'Juni', 'juli': 'Juli', 'august': 'August',
-                    'september': 'September', 'oktober': 'Oktober', 'november': 'November', 'december': 'December'
-                }
-                month_name = month_capitalize.get(month_str.lower(), month_str)
-                
-                year = 2026
-                start_day = int(start_day_str)
-                end_day = int(end_day_str)
-                
-                # Calculate Tuesday (weekly meeting) - weekday 1
-                tuesday_date = calculate_weekday_in_range(start_day, end_day, month_name, year, 1)
-                
-                # Calculate Sunday (weekend meeting) - weekday 6
-                sunday_date = calculate_weekday_in_range(start_day, end_day, month_name, year, 6)
-                
-                current_date = None
-                current_weekend_date = None
-                
-                if tuesday_date:
-                    current_date = f"Tirsdag {tuesday_date.day:02d} {month_name} {tuesday_date.year}"
-                    assigned = set()
-                
-                if sunday_date:
-                    current_weekend_date = f"Søndag {sunday_date.day:02d} {month_name} {sunday_date.year}"
-                    weekend_assigned = set()
-                
-                if 'Intet møde' in line or 'Ingen møde' in line:
-                    current_date = None
-                    current_weekend_date = None
-                    continue
-            elif weekday_date_match:
-                if current_date:
-                    meetings[current_date] = assigned
-                if current_weekend_date:
-                    meetings[current_weekend_date] = weekend_assigned
-                # Reset weekend section flag when we encounter a new date
-                in_weekend_section = False
-                # Add year to weekday dates for consistency
-                weekday_date = weekday_date_match.group(0)
-                current_date = f"{weekday_date} 2025"
-                assigned = set()
-                weekend_assigned = set()
-                current_weekend_date = None
-                if 'Ingen møde' in line:
-                    current_date = None
-                    continue
-            elif weekend_date_match:
-                if current_date:
-                    meetings[current_date] = assigned
-                if current_weekend_date:
-                    meetings[current_weekend_date] = weekend_assigned
-                # Convert DD/MM/YYYY to a readable format
-                day, month, year = weekend_date_match.groups()
-                month_names = {
-                    '01': 'Januar', '02': 'Februar', '03': 'Marts', '04': 'April',
-                    '05': 'Maj', '06': 'Juni', '07': 'Juli', '08': 'August',
-                    '09': 'September', '10': 'Oktober', '11': 'November', '12': 'December'
-                }
-                month_name = month_names.get(month, month)
-                current_date = f"Søndag {day} {month_name} {year}"
-                assigned = set()
-                weekend_assigned = set()
-                current_weekend_date = None
-            elif january_date_match:
-                if current_date:
-                    meetings[current_date] = assigned
-                if current_weekend_date:
-                    meetings[current_weekend_date] = weekend_assigned
-                # Handle January format (e.g., "06. JAN")
-                day = january_date_match.group(1)
-                current_date = f"Tirsdag {day} Januar 2026"
-                assigned = set()
-                weekend_assigned = set()
-                current_weekend_date = None
-                if 'Ingen møde' in line:
-                    current_date = None
-                    continue
-            elif danish_date_match:
-                if current_date:
-                    meetings[current_date] = assigned
-                if current_weekend_date:
-                    meetings[current_weekend_date] = weekend_assigned
-                # Handle other Danish date formats (e.g., "01 Januar 26")
-                day, month = danish_date_match.groups()
-                # Determine year - assume 2026 for January dates, 2025 for others
-                year = "2026" if month == "Januar" else "2025"
-                current_date = f"Tirsdag {day} {month} {year}"
-                assigned = set()
-                weekend_assigned = set()
-                current_weekend_date = None
-                if 'Ingen møde' in line:
-                    current_date = None
-                    continue
-            elif abbrev_date_match:
-                if current_date:
-                    meetings[current_date] = assigned
-                if current_weekend_date:
-                    meetings[current_weekend_date] = weekend_assigned
-                # Handle abbreviated Danish month formats (e.g., "03. FEB")
-                day, abbrev_month = abbrev_date_match.groups()
-                month_map = {
-                    'JAN': 'Januar', 'FEB': 'Februar', 'MAR': 'Marts', 'APR': 'April',
-                    'MAJ': 'Maj', 'JUN': 'Juni', 'JUL': 'Juli', 'AUG': 'August',
-                    'SEP': 'September', 'OKT': 'Oktober', 'NOV': 'November', 'DEC': 'December'
-                }
-                month_name = month_map.get(abbrev_month.upper(), abbrev_month)
-                year = "2026" if month_name in ("Januar", "Februar", "Marts") else "2025"
-                current_date = f"Tirsdag {day} {month_name} {year}"
-                assigned = set()
-                weekend_assigned = set()
-                current_weekend_date = None
-                if 'Ingen møde' in line:
-                    current_date = None
-                    continue
-            
-            # Check if we're entering a weekend meeting section
-            if 'Weekendmødet' in line or 'Weekendopgaver' in line:
-                in_weekend_section = True
-            
-            # Extract names for both weekly (Tuesday) and weekend (Sunday) meetings
-            if current_date or current_weekend_date:
-                # Extract all names from the line, handling various formats
-                names_found = set()
-                
-                # Look for names separated by slashes (e.g., "Christopher Rüdinger/Lucas Vinzentsen")
-                slash_names = re.findall(r'([A-ZÆØÅ][a-zæøåõ]+(?:\s+[A-ZÆØÅ][a-zæøåõ]+)+)(?:\s*/\s*([A-ZÆØÅ][a-zæøåõ]+(?:\s+[A-ZÆØÅ][a-zæøåõ]+)+))?', line)
-                for match in slash_names:
-                    if match[0]:
-                        names_found.add(match[0])
-                    if match[1]:
-                        names_found.add(match[1])
-                
-                # Look for standard Danish names
-                standard_names = re.findall(r'[A-ZÆØÅ][a-zæøåõ]+(?:\s+[A-ZÆØÅ][a-zæøåõ]+)+', line)
-                for name in standard_names:
-                    names_found.add(name)
-                
-                # Look for names after colons (e.g., "Bøn: Marcel Ale", "Kl. 2: Christopher Rüdinger")
-                colon_names = re.findall(r':\s*([A-ZÆØÅ][a-zæøåõ]+(?:\s+[A-ZÆØÅ][a-zæøåõ]+)+)', line)
-                for name in colon_names:
-                    names_found.add(name)
-                
-                # Look for names in parentheses
-                paren_names = re.findall(r'\(([A-ZÆØÅ][a-zæøåõ]+(?:\s+[A-ZÆØÅ][a-zæøåõ]+)+)\)', line)
-                for name in paren_names:
-                    names_found.add(name)
-                
-                # Match found names to members list and add to assigned set
-                for pdf_name in names_found:
-                    matched_member = find_matching_member(pdf_name, members_list)
-                    if matched_member:
-                        # If we're in a weekend section and have a weekend date, assign to weekend
-                        if in_weekend_section and current_weekend_date:
-                            weekend_assigned.add(matched_member)
-                        # Otherwise, assign to weekly meeting (Tuesday)
-                        elif current_date:
-                            assigned.add(matched_member)
-        
-        # Save any remaining dates
-        if current_date:
-            meetings[current_date] = assigned
-        if current_weekend_date:
-            meetings[current_weekend_date] = weekend_assigned
-        
-        # Merge meetings from this PDF into all_meetings
-        for date, assigned_people in meetings.items():
-            if date in all_meetings:
-                # If date already exists, merge the assigned people
-                all_meetings[date].update(assigned_people)
-            else:
-                all_meetings[date] = assigned_people
-    
-    return all_meetings
+            error = None
+    if error is not None:
+        st.error(f"❌ Mødeprogrammerne kunne ikke indlæses: {error}")
+        st.stop()
+    return meetings, job.stats, job.files, job.fuzzy_hits
 
-def generate_schedule(members, meetings, availability=None):
-    """Generate schedule of hosts per meeting date.
+# Rows per page of the registered meetings table
+MEETINGS_PAGE_SIZE = 50
 
-    availability: optional dict name -> flag, e.g. 'sunday_only'.
-    """
-    if availability is None:
-        availability = {}
-    dates = list(meetings.keys())
-    
-    # Create a mapping for Danish month names to numbers for proper sorting
-    month_order = {
-        'Januar': 1, 'Februar': 2, 'Marts': 3, 'April': 4, 'Maj': 5, 'Juni': 6,
-        'Juli': 7, 'August': 8, 'September': 9, 'Oktober': 10, 'November': 11, 'December': 12
-    }
-    
-    def sort_key(date_str):
-        current_year = datetime.datetime.now().year
-        
-        # Handle weekday dates like "Tirsdag 15 Oktober 2025", "Torsdag 09 December"
-        if date_str.startswith(('Tirsdag', 'Mandag', 'Torsdag')):
-            day_match = re.search(r'\d{2}', date_str)
-            month_match = re.search(r'(Januar|Februar|Marts|April|Maj|Juni|Juli|August|September|Oktober|November|December)', date_str)
-            year_match = re.search(r'\d{4}', date_str)
-            if day_match and month_match:
-                day = int(day_match.group(0))
-                month = month_order.get(month_match.group(0), 0)
-                year = int(year_match.group(0)) if year_match else 2025
-                return (year, month, day)
-        
-        # Handle weekend dates like "Søndag 07 September 2025"
-        elif date_str.startswith('Søndag'):
-            parts = date_str.split()
-            if len(parts) >= 4:
-                day = int(parts[1])
-                month = month_order.get(parts[2], 0)
-                year = int(parts[3])
-                return (year, month, day)
-        
-        return (0, 0, 0)
-    
-    dates.sort(key=sort_key)
-    schedule = {}
-    i = 0
-    n = len(members)
-
-    for date in dates:
-        is_sunday_meeting = date.startswith("Søndag")
-
-        def is_available(cand: str) -> bool:
-            note = availability.get(cand)
-            # People marked Sunday only cannot be hosts on non-Sunday meetings
-            if note == "sunday_only" and not is_sunday_meeting:
-                return False
-            # Also skip if already involved in that meeting (from PDF)
-            return cand not in meetings[date]
-
-        vert1 = None
-        vert2 = None
-        attempts = 0
-        max_attempts = n * 2
-
-        while vert1 is None and attempts < max_attempts:
-            cand = members[i % n]
-            i += 1
-            attempts += 1
-            if is_available(cand):
-                vert1 = cand
+def meeting_table(meetings):
+    """The registered meetings as one DataFrame, in the date order parse_program returns them."""
+    return pd.DataFrame({
+        'Dato': [meeting.label for meeting in meetings],
+        'Type': ['Weekend' if meeting.kind == WEEKEND else 'Hverdag' for meeting in meetings],
+        'Opgaver': [
+            ', '.join(sorted(meeting.assignees)) or '(ingen opgaver registreret)' for meeting in meetings
+        ],
+    })
 
-        attempts = 0
-        while vert2 is None and attempts < max_attempts:
-            cand = members[i % n]
-            i += 1
-            attempts += 1
-            if is_available(cand):
-                vert2 = cand
+def reset_meetings_page():
+    # A new filter can have fewer pages than the page shown so far
+    st.session_state.pop('meetings_page', None)
 
-        if vert1 and vert2:
-            schedule[date] = (vert1, vert2)
-        else:
-            schedule[date] = ('No available', 'No available')
+def show_meetings(table):
+    """One page of the meetings table, filtered by meeting type and a search in dates and names."""
+    col_search, col_kind = st.columns([3, 1])
+    with col_search:
+        query = st.text_input(
+            'Søg', placeholder='Navn eller dato', key='meetings_query', on_change=reset_meetings_page
+        ).strip()
+    with col_kind:
+        kind = st.selectbox(
+            'Type', ['Alle', 'Hverdag', 'Weekend'], key='meetings_kind', on_change=reset_meetings_page
+        )
+    if kind != 'Alle':
+        table = table[table['Type'] == kind]
+    if query:
+        table = table[
+            table['Dato'].str.contains(query, case=False, regex=False)
+            | table['Opgaver'].str.contains(query, case=False, regex=False)
+        ]
+    pages = max(1, -(-len(table) // MEETINGS_PAGE_SIZE))
+    page = 1
+    if pages > 1:
+        page = st.number_input('Side', min_value=1, max_value=pages, value=1, key='meetings_page')
+    start = (page - 1) * MEETINGS_PAGE_SIZE
+    rows = table.iloc[start:start + MEETINGS_PAGE_SIZE]
+    st.dataframe(rows, width='stretch', hide_index=True)
+    st.caption(f"Viser {start + 1 if len(rows) else 0}-{start + len(rows)} af {len(table)} møde(r)")
 
-    return schedule
+def lazy_export(create, table):
+    """A download_button callable that builds the file on the first click only."""
+    built = []
 
-def create_xlsx(schedule):
-    output = BytesIO()
-    df = pd.DataFrame({
-        'Dato': list(schedule.keys()),
-        'Vært 1': [v[0] for v in schedule.values()],
-        'Vært 2': [v[1] for v in schedule.values()]
-    })
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Tidsplan')
-    output.seek(0)
-    return output
+    def build():
+        if not built:
+            built.append(create(table))
+        return built[0]
+    return build
 
 # Page configuration
 st.set_page_config(
@@ -569,7 +230,7 @@ with st.sidebar:
     
     st.markdown("### 📁 Filkrav")
     st.markdown("""
-    **Excel-fil:**
+    **Excel- eller CSV-fil:**
     - Mødeværternes navne i første kolonne
     - Starter fra række 3
     
@@ -578,6 +239,50 @@ with st.sidebar:
     - **Weekendmøder:** Datoformat "DD/MM/ÅÅÅÅ" (f.eks. "07/09/2025")
     - Indeholder deltageropgaver
     """)
+    
+    st.markdown("### ⚙️ Planlægning")
+    strategy = st.selectbox(
+        'Fordelingsmetode',
+        options=['fair', 'round_robin'],
+        format_func={'fair': 'Jævn fordeling', 'round_robin': 'Fast rækkefølge'}.get,
+        help="Jævn fordeling vælger dem, der har været vært færrest gange og længst siden"
+    )
+    min_spacing_days = st.number_input(
+        'Mindst antal dage mellem værtskaber', min_value=0, max_value=90, value=0
+    )
+    max_per_month = st.number_input(
+        'Maks. værtskaber pr. person pr. måned (0 = ingen grænse)', min_value=0, max_value=10, value=0
+    )
+    optimize = st.checkbox(
+        'Optimer tidsplan',
+        help="Afprøver flere tidsplaner med forskellige rækkefølger og vælger den mest jævne"
+    )
+    if optimize:
+        candidates = st.slider('Antal forsøg', min_value=2, max_value=64, value=16)
+        time_budget = st.number_input('Maks. søgetid (sekunder)', min_value=1, max_value=60, value=5)
+    incremental = st.checkbox(
+        'Behold tidligere tildelte værter',
+        help="Værter til møder før i dag og til uændrede møder beholdes; kun nye eller ændrede "
+             "programmer indlæses, og kun de berørte fremtidige møder planlægges igen"
+    )
+    use_ledger = st.checkbox(
+        'Fortsæt fra tidligere perioder',
+        help="Tager hensyn til, hvem der var vært i tidligere tidsplaner for samme menighed; "
+             "en færdig tidsplan kan gemmes i historikken"
+    )
+    if use_ledger:
+        past_schedules = st.file_uploader(
+            'Tidligere tidsplaner (XLSX)', type=['xlsx'], accept_multiple_files=True,
+            help="Tidsplaner hentet fra denne app; værterne i dem føjes til historikken"
+        )
+    if incremental or use_ledger:
+        # Stored schedules and the ledger are shared by everyone using this server, so they are
+        # kept under a name the coordinator chooses rather than the name of the uploaded file
+        congregation = st.text_input(
+            'Menighedens navn', key='congregation',
+            help="Tidligere tidsplaner og historik gemmes og findes under dette navn; "
+                 "brug det samme navn hver gang"
+        ).strip()
 
 # Upload section
 st.markdown("### Upload Filer")
@@ -588,8 +293,8 @@ with st.container():
         st.markdown('<div class="upload-section">', unsafe_allow_html=True)
         uploaded_xlsx = st.file_uploader(
             '📊 **Upload Godkendte Mødeværter**', 
-            type=['xlsx'],
-            help="Upload Excel-fil med liste over godkendte mødeværter"
+            type=['xlsx', 'csv'],
+            help="Upload Excel- eller CSV-fil med liste over godkendte mødeværter"
         )
         st.markdown('</div>', unsafe_allow_html=True)
     
@@ -604,7 +309,12 @@ with st.container():
         st.markdown('</div>', unsafe_allow_html=True)
 
 if uploaded_xlsx and uploaded_pdfs:
-    members, availability = parse_members(uploaded_xlsx)
+    run = Instrumentation('app')
+    roster_key = file_key(uploaded_xlsx)
+    pdf_keys = tuple(file_key(pdf) for pdf in uploaded_pdfs)
+    members, availability = memoized(
+        run, 'parse_members', roster_key, lambda: parse_members(uploaded_xlsx)
+    )
     
     # Show uploaded files info
     st.markdown('<div class="info-box">', unsafe_allow_html=True)
@@ -615,68 +325,136 @@ if uploaded_xlsx and uploaded_pdfs:
         st.markdown(f"  {i}. {pdf.name}")
     st.markdown('</div>', unsafe_allow_html=True)
     
-    meetings = parse_program(uploaded_pdfs, members)
+    constraints = SchedulingConstraints(
+        min_spacing_days=min_spacing_days, max_per_month=max_per_month or None
+    )
+    search = (candidates, time_budget) if optimize else None
+    ledger_key = None
+    if use_ledger:
+        ledger_key = (congregation, tuple(file_key(schedule_file) for schedule_file in past_schedules))
+        memoized(run, 'import_ledger', (congregation, ledger_key), lambda: [
+            get_hosting_ledger().import_xlsx(congregation, schedule_file)
+            for schedule_file in past_schedules
+        ])
+    
+    def ledger_history(before):
+        # Hostings of earlier periods, up to the first meeting being scheduled
+        return get_hosting_ledger().history(congregation, before) if use_ledger else None
+    
+    if (incremental or use_ledger) and not congregation:
+        st.warning("⚠️ Angiv menighedens navn i sidepanelet for at bruge tidligere tidsplaner")
+        st.stop()
+    if incremental:
+        # update_schedule parses and schedules in one step and stores the result
+        meetings_key = (
+            'incremental', congregation, roster_key, pdf_keys, strategy, constraints, search, ledger_key,
+            datetime.date.today()
+        )
+        update, page_stats, file_stats = memoized(run, 'update_schedule', meetings_key, lambda: (
+            update_schedule(
+                congregation, uploaded_pdfs, members, availability, get_schedule_store(),
+                strategy=strategy, constraints=constraints, cache=get_page_text_cache(),
+                candidates=candidates if optimize else 1,
+                time_budget=time_budget if optimize else None, stats=run.counters,
+                history=ledger_history(
+                    get_schedule_store().start_date(congregation) or datetime.date.today()
+                )
+            ), run.counters, run.files
+        ))
+        meetings = update.meetings
+        fuzzy_hits = update.fuzzy_hits
+    else:
+        meetings_key = (roster_key, pdf_keys)
+        
+        def parse_programs():
+            meetings, page_stats, file_stats, fuzzy_hits = parse_with_progress(
+                meetings_key, uploaded_pdfs, members
+            )
+            run.counters.update(page_stats)
+            run.files.extend(file_stats)
+            return meetings, page_stats, file_stats, fuzzy_hits
+        
+        meetings, page_stats, file_stats, fuzzy_hits = memoized(
+            run, 'parse_program', meetings_key, parse_programs
+        )
     if meetings:
         # Success message
         st.markdown('<div class="success-box">', unsafe_allow_html=True)
         st.markdown(f"**✅ Succes!** {len(meetings)} møde(r) registreret og behandlet")
+        if page_stats['pages_skipped']:
+            st.markdown(
+                f"{page_stats['pages_skipped']} af {page_stats['pages']} PDF-sider uden mødedatoer "
+                f"eller opgaver blev sprunget over"
+            )
         st.markdown('</div>', unsafe_allow_html=True)
         
-        # Meeting details in expandable section
-        with st.expander("📋 **Se Registrerede Møder og Opgaver**", expanded=False):
-            # Use the same sorting logic as in generate_schedule
-            def display_sort_key(date_str):
-                month_order = {
-                    'Januar': 1, 'Februar': 2, 'Marts': 3, 'April': 4, 'Maj': 5, 'Juni': 6,
-                    'Juli': 7, 'August': 8, 'September': 9, 'Oktober': 10, 'November': 11, 'December': 12
-                }
-                
-                # Handle weekday dates like "Tirsdag 15 Oktober 2025", "Torsdag 09 December"
-                if date_str.startswith(('Tirsdag', 'Mandag', 'Torsdag')):
-                    day_match = re.search(r'\d{2}', date_str)
-                    month_match = re.search(r'(Januar|Februar|Marts|April|Maj|Juni|Juli|August|September|Oktober|November|December)', date_str)
-                    year_match = re.search(r'\d{4}', date_str)
-                    if day_match and month_match:
-                        day = int(day_match.group(0))
-                        month = month_order.get(month_match.group(0), 0)
-                        year = int(year_match.group(0)) if year_match else 2025
-                        return (year, month, day)
-                
-                # Handle weekend dates like "Søndag 07 September 2025"
-                elif date_str.startswith('Søndag'):
-                    parts = date_str.split()
-                    if len(parts) >= 4:
-                        day = int(parts[1])
-                        month = month_order.get(parts[2], 0)
-                        year = int(parts[3])
-                        return (year, month, day)
-                
-                return (0, 0, 0)
-            
-            for date in sorted(meetings.keys(), key=display_sort_key):
-                assigned_people = meetings[date]
-                if assigned_people:
-                    st.markdown(f"**{date}:** {', '.join(sorted(assigned_people))}")
-                else:
-                    st.markdown(f"**{date}:** *(ingen opgaver registreret)*")
+        if fuzzy_hits:
+            # Misspelled names are matched, but shown so a wrong guess can be caught
+            with st.expander(f"🔤 **{len(fuzzy_hits)} navn(e) matchet trods stavefejl**", expanded=False):
+                st.dataframe(
+                    pd.DataFrame(
+                        [(pdf_name, hit.member, hit.score) for pdf_name, hit in sorted(fuzzy_hits.items())],
+                        columns=['Navn i program', 'Medlem', 'Lighed']
+                    ),
+                    width='stretch',
+                    hide_index=True
+                )
+        
+        # Meeting details; on_change='rerun' tells the script whether the expander is open,
+        # so the table is only built and sent while it is
+        meetings_view = st.expander(
+            "📋 **Se Registrerede Møder og Opgaver**", key='meetings_view', on_change='rerun'
+        )
+        with meetings_view:
+            if meetings_view.open:
+                show_meetings(
+                    memoized(run, 'meeting_table', meetings_key, lambda: meeting_table(meetings))
+                )
         
         # Generate and display schedule
-        schedule = generate_schedule(members, meetings, availability)
+        def build_schedule():
+            matrix = AvailabilityMatrix(members, meetings, availability)
+            if incremental:
+                schedule = update.schedule
+            elif optimize:
+                schedule, score = search_schedules(
+                    members, meetings, availability, constraints,
+                    candidates=candidates, time_budget=time_budget,
+                    history=ledger_history(meetings[0].date)
+                )
+            else:
+                schedule = generate_schedule(
+                    members, meetings, availability, strategy=strategy, constraints=constraints,
+                    matrix=matrix, history=ledger_history(meetings[0].date)
+                )
+            if not optimize or incremental:
+                score = score_schedule(matrix, schedule, constraints)
+            # One table feeds the display and all downloads
+            table = ScheduleTable(schedule)
+            exports = {
+                'xlsx': lazy_export(create_xlsx, table),
+                'csv': lazy_export(create_csv, table),
+                'parquet': lazy_export(create_parquet, table),
+            }
+            return matrix, schedule, score, table, exports
+        
+        matrix, schedule, score, table, exports = memoized(
+            run, 'generate_schedule', (meetings_key, strategy, constraints, search, ledger_key),
+            build_schedule
+        )
+        if incremental:
+            st.info(
+                f"♻️ {update.parsed_files} PDF-fil(er) indlæst, "
+                f"{update.resolved_meetings} møde(r) planlagt på ny, resten beholdt"
+            )
         
         st.markdown("### 📅 Genereret Tidsplan")
         st.markdown('<div class="schedule-table">', unsafe_allow_html=True)
         
-        # Create a styled dataframe
-        df_schedule = pd.DataFrame({
-            'Dato': list(schedule.keys()),
-            'Vært 1': [v[0] for v in schedule.values()],
-            'Vært 2': [v[1] for v in schedule.values()]
-        })
-        
         # Display with better formatting
         st.dataframe(
-            df_schedule,
-            use_container_width=True,
+            table.columns,
+            width='stretch',
             hide_index=True,
             column_config={
                 "Dato": st.column_config.TextColumn("📅 Dato", width="medium"),
@@ -686,19 +464,42 @@ if uploaded_xlsx and uploaded_pdfs:
         )
         st.markdown('</div>', unsafe_allow_html=True)
         
-        # Download section
+        # Download section; the files are only built when a button is clicked
         st.markdown("### 💾 Download Resultater")
-        output = create_xlsx(schedule)
-        
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             st.download_button(
                 label='📥 Download Tidsplan (XLSX)',
-                data=output,
+                data=exports['xlsx'],
                 file_name='modevart_tidsplan.xlsx',
                 mime='application/vnd.ms-excel',
-                use_container_width=True
+                width='stretch'
             )
+            col_csv, col_parquet = st.columns(2)
+            with col_csv:
+                st.download_button(
+                    label='📄 CSV',
+                    data=exports['csv'],
+                    file_name='modevart_tidsplan.csv',
+                    mime='text/csv',
+                    width='stretch'
+                )
+            with col_parquet:
+                st.download_button(
+                    label='🗄️ Parquet',
+                    data=exports['parquet'],
+                    file_name='modevart_tidsplan.parquet',
+                    mime='application/vnd.apache.parquet',
+                    width='stretch'
+                )
+            if use_ledger:
+                # Only a schedule the coordinator settles on goes into the history; a rerun
+                # with other settings must not count as hostings that never happen
+                if st.button('💾 Gem tidsplan i historikken', width='stretch',
+                             help="Gemmer værterne i denne tidsplan i historikken for menigheden, "
+                                  "så næste periode fortsætter herfra"):
+                    saved = get_hosting_ledger().record(congregation, schedule)
+                    st.success(f"✅ {saved} værtskaber gemt i historikken for {congregation}")
         
         # Summary statistics
         st.markdown("### 📊 Oversigt")
@@ -710,8 +511,52 @@ if uploaded_xlsx and uploaded_pdfs:
         with col3:
             st.metric("Tilgængelige Mødeværter", len(members))
         with col4:
-            conflicts_avoided = sum(1 for date, assigned in meetings.items() if len(assigned) > 0)
-            st.metric("Konflikter Undgået", conflicts_avoided)
+            st.metric("Konflikter Undgået", matrix.meetings_with_conflicts())
+        
+        load_stats = matrix.load_statistics(schedule)
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Færrest Værtskaber", load_stats['min'])
+        with col2:
+            st.metric("Flest Værtskaber", load_stats['max'])
+        with col3:
+            st.metric("Gns. Værtskaber", f"{load_stats['mean']:.1f}")
+        with col4:
+            st.metric("Spredning (std.)", f"{load_stats['std']:.2f}")
+        if optimize and not incremental:
+            st.caption(
+                f"Bedste af {score['evaluated']} afprøvede tidsplaner: kvalitetsscore {score['total']:.2f} "
+                f"(lavere er bedre), {score['spacing_violations']} værtskab(er) tæt efter hinanden"
+            )
+        
+        with st.expander("📈 **Værtskaber pr. Mødevært**", expanded=False):
+            st.dataframe(
+                pd.DataFrame({
+                    'Mødevært': matrix.members,
+                    'Værtskaber': matrix.load(schedule),
+                    'Opgaver i program': matrix.conflicts.sum(axis=1)
+                }),
+                width='stretch',
+                hide_index=True
+            )
             
     else:
         st.error('❌ Ingen møder fundet i de uploadede PDF-filer. Kontroller venligst dine filer og prøv igen.')
+    
+    report = run.finish()
+    with st.expander("⏱️ **Ydelse og Diagnostik**", expanded=False):
+        st.dataframe(
+            pd.DataFrame(report['stages']).rename(columns={
+                'stage': 'Trin', 'wall_s': 'Tid (s)', 'cpu_s': 'CPU (s)', 'peak_kib': 'Maks. hukommelse (KiB)',
+                'reused': 'Genbrugt'
+            }),
+            width='stretch',
+            hide_index=True
+        )
+        if file_stats:
+            files = pd.DataFrame(file_stats)
+            if len(files) == len(uploaded_pdfs):
+                files.insert(0, 'PDF', [pdf.name for pdf in uploaded_pdfs])
+            st.dataframe(files, width='stretch', hide_index=True)
+        if report['profile']:
+            st.caption(f"cProfile-data gemt i {report['profile']}")
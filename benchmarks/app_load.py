@@ -0,0 +1,241 @@
+"""Drive app.py from several simulated sessions at once and report rerun latency.
+
+Usage: python benchmarks/app_load.py [--sessions 4] [--reruns 12] [--members 200] [--weeks 26]
+                                     [--programs 2] [--shared-inputs] [--output results.json]
+
+Every session is a streamlit.testing.v1.AppTest of app.py (no browser, no
+server) in its own process. The sessions start together, upload a synthetic
+roster and programs (see synthetic.py) and then go through --reruns
+interactions a coordinator would make: a plain rerun, another minimum
+spacing, the meetings table with a search, another strategy. Each AppTest
+run is one rerun; its wall time is its latency.
+
+Without --shared-inputs every session uploads different files, as separate
+coordinators would; with it they all upload the same files and share the
+page text cache. The page text cache starts empty in a temporary directory
+unless MODEVAERT_CACHE_DIR is set.
+
+Reported are the p50/p95/p99 latency of the upload rerun (parsing and
+scheduling), of the interactions and of all reruns, the reruns per second
+from the first upload to the last rerun, and the peak RSS of the largest
+session and of all sessions together (extraction pool workers not included;
+--workers 1 keeps the extraction in the session processes).
+
+AppTest keeps the state of a run in process-wide globals, so sessions cannot
+share one process the way they share the Streamlit server in production.
+They do compete for the CPU cores and share the page text cache on disk;
+contention for the GIL and for in-process caches (st.cache_resource) is not
+part of the numbers.
+"""
+import argparse
+import json
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import synthetic  # noqa: E402
+
+APP = os.path.join(ROOT, 'app.py')
+
+def make_inputs(member_count, weeks, programs, seed):
+    """Return (roster upload, program uploads) as AppTest file uploader values."""
+    roster = synthetic.make_roster(member_count, seed=seed)
+    roster_file = (f'roster-{seed}.xlsx', synthetic.roster_xlsx(roster), 'application/octet-stream')
+    program_files = [
+        (f'program-{seed}-{number + 1}.pdf',
+         synthetic.make_program(roster, weeks, seed * 100 + number, filler_pages=1), 'application/pdf')
+        for number in range(programs)
+    ]
+    return roster_file, program_files
+
+def widget(elements, label):
+    return next(element for element in elements if element.label.startswith(label))
+
+def interact(at, step):
+    """Change what the step-th interaction changes; returns its name."""
+    kind = ('rerun', 'spacing', 'meetings', 'strategy')[step % 4]
+    if kind == 'spacing':
+        widget(at.number_input, 'Mindst antal dage').set_value(7 * (step // 4 % 3 + 1))
+    elif kind == 'meetings':
+        # Widget state can be set before the widget was ever shown
+        at.session_state['meetings_query'] = 'sen' if step // 4 % 2 else ''
+    elif kind == 'strategy':
+        strategy = widget(at.selectbox, 'Fordelingsmetode')
+        strategy.set_value('round_robin' if strategy.value == 'fair' else 'fair')
+    return kind
+
+def run_session(number, inputs, reruns, start_barrier, timeout, results):
+    """One simulated coordinator, in its own process; puts its report on the results queue.
+
+    The report holds (kind, seconds) of every rerun, the wall clock time of the
+    first rerun's start and the last one's end, and the peak RSS of the session.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    # Keep the app's JSON run reports off the terminal
+    logging.getLogger('modevaert').addHandler(logging.NullHandler())
+    latencies = []
+    started = finished = None
+    error = None
+    try:
+        at = AppTest.from_file(APP, default_timeout=timeout)
+        at.run()
+        roster_file, program_files = inputs
+        at.file_uploader[0].set_value(roster_file)
+        at.file_uploader[1].set_value(program_files)
+        start_barrier.wait(timeout)
+        started = time.time()
+        meetings_open = False
+        for step in range(-1, reruns):
+            kind = interact(at, step) if step >= 0 else 'upload'
+            # AppTest does not keep an expander open across reruns as a browser does
+            meetings_open = meetings_open or kind == 'meetings'
+            at.session_state['meetings_view'] = meetings_open
+            start = time.perf_counter()
+            at.run(timeout=timeout)
+            latencies.append((kind, time.perf_counter() - start))
+            finished = time.time()
+            if at.exception:
+                raise RuntimeError(f'{kind}: {at.exception[0].message}')
+    except Exception as exc:
+        error = f'{type(exc).__name__}: {exc}'
+        start_barrier.abort()
+    results.put({
+        'session': number, 'latencies': latencies, 'started': started, 'finished': finished,
+        'error': error, 'peak_rss_kib': peak_rss_kib(),
+    })
+
+def percentile(values, share):
+    """The nearest-rank percentile of values (share between 0 and 1)."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(share * len(ordered)), 1) - 1]
+
+def summarize(latencies):
+    return {
+        'reruns': len(latencies),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+        'max_ms': round(max(latencies) * 1000, 1),
+    }
+
+def peak_rss_kib():
+    """Peak resident set size of this process in KiB, or None without the resource module."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    scale = 1024 if sys.platform == 'darwin' else 1
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale
+
+def run_load(args):
+    print(f'generating inputs for {args.sessions} session(s) ...')
+    if args.shared_inputs:
+        inputs = [make_inputs(args.members, args.weeks, args.programs, seed=1)] * args.sessions
+    else:
+        inputs = [make_inputs(args.members, args.weeks, args.programs, seed=number + 1)
+                  for number in range(args.sessions)]
+
+    # AppTest keeps the state of a run in process-wide globals (the runtime
+    # instance, the testing config option), so concurrent sessions need processes
+    context = multiprocessing.get_context('spawn')
+    start_barrier = context.Barrier(args.sessions)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=run_session, name=f'session-{number}',
+            args=(number, session_inputs, args.reruns, start_barrier, args.timeout, results)
+        )
+        for number, session_inputs in enumerate(inputs)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    failed = [report for report in reports if report['error'] is not None]
+    for report in failed:
+        print(f"session-{report['session']} failed: {report['error']}", file=sys.stderr)
+    latencies = [latency for report in reports for latency in report['latencies']]
+    if not latencies:
+        return None
+    elapsed = (max(report['finished'] for report in reports if report['finished'])
+               - min(report['started'] for report in reports if report['started']))
+    by_kind = {}
+    for kind, seconds in latencies:
+        by_kind.setdefault(kind, []).append(seconds)
+    interactions = [seconds for kind, seconds in latencies if kind != 'upload']
+    rss = [report['peak_rss_kib'] for report in reports if report['peak_rss_kib'] is not None]
+    return {
+        'sessions': args.sessions,
+        'failed_sessions': len(failed),
+        'members': args.members,
+        'weeks': args.weeks,
+        'programs': args.programs,
+        'shared_inputs': args.shared_inputs,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'all': summarize([seconds for _, seconds in latencies]),
+        'upload': summarize(by_kind['upload']) if 'upload' in by_kind else None,
+        'interaction': summarize(interactions) if interactions else None,
+        'by_kind': {kind: summarize(values) for kind, values in sorted(by_kind.items())},
+        'peak_session_rss_kib': max(rss) if rss else None,
+        'total_session_rss_kib': sum(rss) if rss else None,
+    }
+
+def print_report(report):
+    print(f"{report['sessions']} session(s), {report['members']} members, "
+          f"{report['programs']} x {report['weeks']} weeks: {report['all']['reruns']} reruns "
+          f"in {report['elapsed_s']:.2f} s, {report['throughput_rps']:.2f} reruns/s")
+    for name in ('upload', 'interaction', 'all'):
+        row = report[name]
+        if row:
+            print(f"  {name:<12} p50 {row['p50_ms']:8.1f} ms  p95 {row['p95_ms']:8.1f} ms  "
+                  f"p99 {row['p99_ms']:8.1f} ms  ({row['reruns']} reruns)")
+    if report['peak_session_rss_kib'] is not None:
+        print(f"  peak RSS {report['peak_session_rss_kib'] / 1024:.0f} MiB per session, "
+              f"{report['total_session_rss_kib'] / 1024:.0f} MiB for all sessions")
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Measure app.py rerun latency under concurrent sessions.')
+    parser.add_argument('--sessions', type=int, default=4, help='simulated concurrent sessions')
+    parser.add_argument('--reruns', type=int, default=12, help='interactions per session after the upload')
+    parser.add_argument('--members', type=int, default=200, help='roster size')
+    parser.add_argument('--weeks', type=int, default=26, help='weeks per program')
+    parser.add_argument('--programs', type=int, default=2, help='program PDFs per session')
+    parser.add_argument('--shared-inputs', action='store_true', help='every session uploads the same files')
+    parser.add_argument('--workers', type=int, help='MODEVAERT_WORKERS for the app (default: unchanged)')
+    parser.add_argument('--timeout', type=float, default=300, help='seconds one rerun may take')
+    parser.add_argument('--output', help='write the report as JSON to this file')
+    args = parser.parse_args(argv)
+    args.sessions = max(1, args.sessions)
+
+    # The session processes inherit these; modevaert reads them on import
+    if args.workers is not None:
+        os.environ['MODEVAERT_WORKERS'] = str(args.workers)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ.setdefault('MODEVAERT_CACHE_DIR', cache_dir)
+        report = run_load(args)
+    if report is None:
+        print('no rerun completed', file=sys.stderr)
+        return 1
+    report['python'] = platform.python_version()
+    report['machine'] = platform.machine()
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+    return 1 if report['failed_sessions'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
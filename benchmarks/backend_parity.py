@@ -0,0 +1,64 @@
+"""Check that every extraction backend finds the same meetings in our programs.
+
+Usage: python benchmarks/backend_parity.py ROSTER.xlsx PROGRAM.pdf [PROGRAM.pdf ...]
+
+Each program is parsed with every backend in modevaert.backends.BACKENDS and
+the resulting meetings (dates, kinds and assigned members) are compared with
+pdfplumber's. The script prints the extraction time per backend and the first
+differences per program, and exits with 1 if any backend disagrees.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modevaert.backends import BACKENDS, FALLBACK_BACKEND  # noqa: E402
+from modevaert.members import MemberMatcher, parse_members  # noqa: E402
+from modevaert.program import parse_program_files  # noqa: E402
+
+def describe(key, meetings):
+    date, kind = key
+    if key not in meetings:
+        return f'{date} {kind}: missing'
+    return f'{date} {kind}: {sorted(meetings[key])}'
+
+def main(argv):
+    if len(argv) < 2:
+        print(__doc__.strip().splitlines()[2], file=sys.stderr)
+        return 2
+    members, _availability = parse_members(argv[0])
+    matcher = MemberMatcher(members)
+    paths = argv[1:]
+    blobs = []
+    for path in paths:
+        with open(path, 'rb') as pdf_file:
+            blobs.append(pdf_file.read())
+
+    results = {}
+    for name in BACKENDS:
+        start = time.perf_counter()
+        results[name] = list(parse_program_files(blobs, matcher, workers=1, backend=name))
+        print(f'{name:12} {time.perf_counter() - start:8.3f} s')
+
+    mismatches = 0
+    reference = results[FALLBACK_BACKEND]
+    for name, per_file in results.items():
+        if name == FALLBACK_BACKEND:
+            continue
+        for path, expected, found in zip(paths, reference, per_file):
+            if found == expected:
+                print(f'{name}: {os.path.basename(path)}: {len(found)} meeting(s), identical')
+                continue
+            mismatches += 1
+            differing = sorted(
+                key for key in set(expected) | set(found) if expected.get(key) != found.get(key)
+            )
+            print(f'{name}: {os.path.basename(path)}: {len(differing)} meeting(s) differ')
+            for key in differing[:5]:
+                print(f'  {FALLBACK_BACKEND}: {describe(key, expected)}')
+                print(f'  {name}: {describe(key, found)}')
+    return 1 if mismatches else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,97 @@
+"""Compare the single-pass name scanner with the former four-pass extraction.
+
+Usage: python benchmarks/name_scanner.py [program.pdf ...]
+
+Without arguments a synthetic set of program lines is used. The script checks
+that every name found by the four findall passes is also found by
+extract_candidate_names, and reports the time per line of both approaches.
+"""
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modevaert.extraction import iter_page_texts  # noqa: E402
+from modevaert.parsing import extract_candidate_names  # noqa: E402
+
+NAME = r'[A-ZÆØÅ][a-zæøåõ]+(?:\s+[A-ZÆØÅ][a-zæøåõ]+)+'
+SLASH_RE = re.compile(rf'({NAME})(?:\s*/\s*({NAME}))?')
+STANDARD_RE = re.compile(NAME)
+COLON_RE = re.compile(rf':\s*({NAME})')
+PAREN_RE = re.compile(rf'\(({NAME})\)')
+
+FIRST_NAMES = ['Christopher', 'Lucas', 'Marcel', 'Søren', 'Åse', 'Mette', 'Ørjan', 'Jens']
+LAST_NAMES = ['Rüdinger', 'Vinzentsen', 'Ale', 'Hansen', 'Møller', 'Ørsted', 'Jensen']
+
+def four_pass_names(line):
+    """The name extraction parse_program used before the single-pass scanner."""
+    names_found = set()
+    for first, second in SLASH_RE.findall(line):
+        if first:
+            names_found.add(first)
+        if second:
+            names_found.add(second)
+    names_found.update(STANDARD_RE.findall(line))
+    names_found.update(COLON_RE.findall(line))
+    names_found.update(PAREN_RE.findall(line))
+    return names_found
+
+def single_pass_names(line):
+    return {name for name, _context in extract_candidate_names(line)}
+
+def synthetic_lines(count, seed=0):
+    rng = random.Random(seed)
+
+    def name():
+        return f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+
+    templates = [
+        lambda: f'Bøn: {name()}',
+        lambda: f'Kl. 2: {name()}',
+        lambda: f'{name()}/{name()}',
+        lambda: f'{name()} / {name()}',
+        lambda: f'Vagttårnet ({name()})',
+        lambda: f'3. Find skatte i Guds ord (10 min.) {name()}',
+        lambda: f'Sang {rng.randint(1, 150)} og bøn',
+        lambda: 'UGENS BIBELLÆSNING: ESAJAS 17-20',
+        lambda: f'Tirsdag {rng.randint(1, 28):02d} September | {name()}',
+    ]
+    return [rng.choice(templates)() for _ in range(count)]
+
+def pdf_lines(paths):
+    lines = []
+    for path in paths:
+        with open(path, 'rb') as pdf_file:
+            for page_text in iter_page_texts(pdf_file.read()):
+                lines.extend(line.strip() for line in page_text.split('\n'))
+    return lines
+
+def main(argv):
+    lines = pdf_lines(argv) if argv else synthetic_lines(5000)
+
+    missing = [
+        (line, four_pass_names(line) - single_pass_names(line))
+        for line in lines
+        if not four_pass_names(line) <= single_pass_names(line)
+    ]
+    for line, names in missing[:10]:
+        print(f'MISSING {sorted(names)} in {line!r}')
+
+    # Interleave the rounds and keep the fastest of each, so machine noise hits both alike
+    number = max(1, 20_000 // max(len(lines), 1))
+    old = new = float('inf')
+    for _ in range(9):
+        old = min(old, timeit.timeit(lambda: [four_pass_names(line) for line in lines], number=number))
+        new = min(new, timeit.timeit(lambda: [single_pass_names(line) for line in lines], number=number))
+    per_line = 1e6 / (len(lines) * number)
+    print(f'{len(lines)} lines, best of 9 rounds')
+    print(f'four-pass:   {old * per_line:.2f} µs/line')
+    print(f'single-pass: {new * per_line:.2f} µs/line ({old / new:.2f}x)')
+    print('complete' if not missing else f'{len(missing)} line(s) with missing names')
+    return 1 if missing else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
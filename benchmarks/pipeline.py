@@ -0,0 +1,162 @@
+"""Time each pipeline stage over a sweep of synthetic congregation sizes.
+
+Usage: python benchmarks/pipeline.py [--sizes 50:26,200:52] [--output results.json]
+                                     [--baseline baseline.json [--save-baseline]] [--threshold 0.25]
+
+Each size MEMBERS:WEEKS is a roster of MEMBERS people (see synthetic.py) and
+two programs of WEEKS weeks each. The stages parse_members, parse_program,
+generate_schedule and create_xlsx run --repeat times without the page text
+cache and the fastest wall time of each is kept; extraction and name
+matching are also reported separately from parse_program's counters.
+
+With --baseline the results are compared with an earlier --output file and
+the script exits with status 1 when a stage is more than --threshold slower
+(relative) and more than --min-delta seconds slower (absolute, to ignore
+noise in stages that take a few milliseconds). --save-baseline writes the
+results to the --baseline file instead, and is an error without it.
+Baselines are machine-specific, so keep them next to the machine that runs
+the comparison.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import synthetic  # noqa: E402
+from modevaert import members as members_module  # noqa: E402
+from modevaert.backends import AUTO, BACKENDS, DEFAULT_BACKEND  # noqa: E402
+from modevaert.export import create_xlsx  # noqa: E402
+from modevaert.instrumentation import Instrumentation  # noqa: E402
+from modevaert.members import parse_members  # noqa: E402
+from modevaert.program import parse_program  # noqa: E402
+from modevaert.schedule import generate_schedule  # noqa: E402
+
+DEFAULT_SIZES = '50:26,200:52,800:104'
+
+def parse_sizes(text):
+    sizes = []
+    for item in text.split(','):
+        members, _, weeks = item.partition(':')
+        sizes.append((int(members), int(weeks or 26)))
+    return sizes
+
+def write_inputs(directory, member_count, weeks, seed=0):
+    """Write a synthetic roster and two programs; return (roster path, program paths)."""
+    roster = synthetic.make_roster(member_count, seed=seed)
+    roster_path = os.path.join(directory, f'roster-{member_count}.xlsx')
+    with open(roster_path, 'wb') as output:
+        output.write(synthetic.roster_xlsx(roster))
+    program_paths = []
+    start = datetime.date(2025, 9, 1)
+    for number in range(2):
+        path = os.path.join(directory, f'program-{member_count}-{number + 1}.pdf')
+        with open(path, 'wb') as output:
+            output.write(synthetic.make_program(roster, weeks, seed + number, start=start, filler_pages=1))
+        program_paths.append(path)
+        start += datetime.timedelta(weeks=weeks)
+    return roster_path, program_paths
+
+def run_once(roster_path, program_paths, backend):
+    """Run the pipeline once; return ({stage: wall seconds}, meeting count)."""
+    # parse_members memoizes rosters by content; every repeat should parse again
+    members_module._roster_cache.clear()
+    run = Instrumentation('benchmark', trace_memory=False, profile_dir=None)
+    with run.stage('parse_members'):
+        members, availability = parse_members(roster_path)
+    with run.stage('parse_program'):
+        meetings = parse_program(program_paths, members, workers=1, backend=backend, stats=run.counters)
+    with run.stage('generate_schedule'):
+        schedule = generate_schedule(members, meetings, availability)
+    with run.stage('create_xlsx'):
+        create_xlsx(schedule)
+    timings = {stage['stage']: stage['wall_s'] for stage in run.stages}
+    timings['extract'] = run.counters['extract_s']
+    timings['match'] = run.counters['match_s']
+    return timings, len(meetings)
+
+def run_sweep(sizes, repeat, backend):
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for index, (member_count, weeks) in enumerate(sizes):
+            roster_path, program_paths = write_inputs(directory, member_count, weeks)
+            if index == 0:
+                # Keep the lazy imports of openpyxl, pypdfium2 etc. out of the first timings
+                run_once(roster_path, program_paths, backend)
+            best = {}
+            for _ in range(repeat):
+                timings, meeting_count = run_once(roster_path, program_paths, backend)
+                for stage, seconds in timings.items():
+                    best[stage] = min(seconds, best.get(stage, seconds))
+            for stage, seconds in best.items():
+                results.append({
+                    'members': member_count, 'weeks': weeks, 'meetings': meeting_count,
+                    'stage': stage, 'wall_s': round(seconds, 6),
+                })
+            print(f'{member_count} members, {weeks} weeks, {meeting_count} meetings: ' + ', '.join(
+                f'{stage} {seconds * 1000:.1f} ms' for stage, seconds in best.items()
+            ))
+    return results
+
+def find_regressions(results, baseline, threshold, min_delta):
+    """Return (key, baseline seconds, seconds) for every stage slower than allowed."""
+    previous = {(row['members'], row['weeks'], row['stage']): row['wall_s'] for row in baseline['results']}
+    regressions = []
+    for row in results:
+        key = (row['members'], row['weeks'], row['stage'])
+        if key not in previous:
+            continue
+        before, after = previous[key], row['wall_s']
+        if after > before * (1 + threshold) and after - before > min_delta:
+            regressions.append((key, before, after))
+    return regressions
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Time each pipeline stage over a size sweep.')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='MEMBERS:WEEKS,... (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per size; the fastest counts')
+    parser.add_argument('--pdf-backend', choices=[AUTO, *sorted(BACKENDS)], default=DEFAULT_BACKEND)
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='results of an earlier run to compare with')
+    parser.add_argument('--save-baseline', action='store_true', help='write the results to --baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed relative slowdown')
+    parser.add_argument('--min-delta', type=float, default=0.005, help='ignored absolute slowdown (s)')
+    args = parser.parse_args(argv)
+    if args.save_baseline and not args.baseline:
+        parser.error('--save-baseline needs --baseline to name the file to write')
+
+    results = run_sweep(parse_sizes(args.sizes), max(1, args.repeat), args.pdf_backend)
+    document = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'backend': args.pdf_backend,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(document, output, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as output:
+            json.dump(document, output, indent=2)
+        print(f'baseline written to {args.baseline}')
+        return 0
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = find_regressions(results, baseline, args.threshold, args.min_delta)
+    for (member_count, weeks, stage), before, after in regressions:
+        print(f'REGRESSION {stage} at {member_count}:{weeks}: '
+              f'{before * 1000:.1f} ms -> {after * 1000:.1f} ms')
+    if regressions:
+        return 1
+    print(f'no stage slower than the baseline by more than {args.threshold:.0%}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
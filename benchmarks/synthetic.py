@@ -0,0 +1,213 @@
+"""Synthetic rosters and meeting programs for benchmarks.
+
+Usage: python benchmarks/synthetic.py OUTPUT_DIR [--members N] [--weeks N] [--programs N]
+
+Writes roster.xlsx, roster.csv and program-<n>.pdf to OUTPUT_DIR. Programs
+contain every date header format parse_program recognizes: weekday headers
+("Tirsdag 02 September"), weekend dates ("07/09/2025"), January workbook
+headers ("06. JAN | ..."), full month names ("01. Januar 26"), abbreviated
+months ("03. FEB", "10 feb"), single-month ranges ("marts 02-08"),
+cross-month ranges ("Marts 30-april 05") and "Ingen møde" weeks. Names
+appear after colons, in parentheses, around slashes and on their own, with
+a share of people who are not on the roster. Optional filler pages (song
+lists) exercise the page prefilter.
+
+The PDF writer has no dependencies: one Helvetica text line per program line.
+"""
+import argparse
+import csv
+import datetime
+import io
+import os
+import random
+
+FIRST_NAMES = [
+    'Jens', 'Marie', 'Peter', 'Lucas', 'Christopher', 'Anne', 'Søren', 'Mette', 'Henrik', 'Åse',
+    'Ole', 'Kirsten', 'Lars', 'Birgitte', 'Niels', 'Ørjan', 'Michael', 'Hanne', 'Rasmus', 'Louise',
+    'Marcel', 'Ida', 'Emil', 'Freja', 'Mads', 'Sofie', 'Jonas', 'Laura', 'Mikkel', 'Emma',
+]
+LAST_NAMES = [
+    'Hansen', 'Jensen', 'Olsen', 'Vinzentsen', 'Rüdinger', 'Nielsen', 'Pedersen', 'Keler',
+    'Sørensen', 'Rasmussen', 'Christensen', 'Larsen', 'Andersen', 'Møller', 'Madsen', 'Kristensen',
+    'Ale', 'Holm', 'Dahl', 'Berg', 'Østergaard', 'Lund', 'Poulsen', 'Thomsen', 'Frederiksen',
+]
+MONTHS = [
+    'Januar', 'Februar', 'Marts', 'April', 'Maj', 'Juni',
+    'Juli', 'August', 'September', 'Oktober', 'November', 'December'
+]
+# Header formats cycled through week by week
+FORMATS = ('weekday', 'january', 'danish', 'abbrev', 'range', 'cross', 'weekday_thursday')
+
+def make_roster(size, sunday_only=0.15, seed=0):
+    """Return `size` distinct (name, note) pairs; about `sunday_only` of them are Sunday-only."""
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < size:
+        # A middle name once the plain combinations run out keeps large rosters realistic
+        middle = f' {rng.choice(FIRST_NAMES)}' if len(names) > len(FIRST_NAMES) * len(LAST_NAMES) // 2 else ''
+        names.add(f'{rng.choice(FIRST_NAMES)}{middle} {rng.choice(LAST_NAMES)}')
+    names = sorted(names)
+    rng.shuffle(names)
+    return [(name, 'Sunday only' if rng.random() < sunday_only else None) for name in names]
+
+def roster_xlsx(roster):
+    """The roster as an .xlsx file: two header rows, names in column A, notes in column B."""
+    import xlsxwriter
+
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output)
+    sheet = workbook.add_worksheet()
+    sheet.write(0, 0, 'Godkendte mødeværter')
+    sheet.write_row(1, 0, ('Navn', 'Note'))
+    for row, (name, note) in enumerate(roster, 2):
+        sheet.write(row, 0, name)
+        if note:
+            sheet.write(row, 1, note)
+    workbook.close()
+    return output.getvalue()
+
+def roster_csv(roster):
+    text = io.StringIO()
+    writer = csv.writer(text, delimiter=';')
+    writer.writerow(['Godkendte mødeværter'])
+    writer.writerow(['Navn', 'Note'])
+    writer.writerows([name, note or ''] for name, note in roster)
+    return text.getvalue().encode('utf-8-sig')
+
+def _header(fmt, monday, no_meeting):
+    tuesday = monday + datetime.timedelta(days=1)
+    sunday = monday + datetime.timedelta(days=6)
+    suffix = ' Ingen møde' if no_meeting else ''
+    if fmt == 'weekday':
+        return f'Tirsdag {tuesday.day:02d} {MONTHS[tuesday.month - 1]} | Sang 12{suffix}'
+    if fmt == 'weekday_thursday':
+        thursday = monday + datetime.timedelta(days=3)
+        return f'Torsdag {thursday.day:02d} {MONTHS[thursday.month - 1]}{suffix}'
+    if fmt == 'january' and tuesday.month == 1:
+        return f'{tuesday.day:02d}. JAN | UGENS BIBELLÆSNING: ESAJAS 17-20{suffix}'
+    if fmt == 'january':
+        return f'{tuesday.day:02d} {MONTHS[tuesday.month - 1][:3].lower()}{suffix}'
+    if fmt == 'danish':
+        return f'{tuesday.day:02d}. {MONTHS[tuesday.month - 1]} {tuesday.year % 100:02d}{suffix}'
+    if fmt == 'abbrev':
+        return f'{tuesday.day:02d}. {MONTHS[tuesday.month - 1][:3].upper()} | UGENS BIBELLÆSNING{suffix}'
+    if fmt == 'range' and monday.month == sunday.month:
+        return f'{MONTHS[monday.month - 1].lower()} {monday.day:02d}-{sunday.day:02d}{suffix}'
+    # Cross-month range, also written for weeks that stay inside one month
+    return (f'{MONTHS[monday.month - 1]} {monday.day:02d}-'
+            f'{MONTHS[sunday.month - 1].lower()} {sunday.day:02d}{suffix}')
+
+def _person(rng, roster, strangers):
+    if rng.random() < 0.1:
+        return rng.choice(strangers)
+    return rng.choice(roster)[0]
+
+def make_program_pages(roster, weeks=26, seed=0, start=datetime.date(2025, 9, 1), filler_pages=0,
+                       lines_per_page=40):
+    """Return the pages (lists of lines) of one synthetic program."""
+    rng = random.Random(seed)
+    strangers = [f'{first} {last}' for first, last in zip(('Lis', 'Kaj', 'Bo'), ('Ukendt', 'Fremmed', 'Gæst'))]
+    monday = start - datetime.timedelta(days=start.weekday())
+    pages = [['MØDEPROGRAM', 'Sangliste og vejledning', 'Læs venligst instruktionerne']]
+    page = []
+    for week in range(weeks):
+        fmt = FORMATS[week % len(FORMATS)]
+        no_meeting = rng.random() < 0.05
+        page.append(_header(fmt, monday, no_meeting))
+        person = lambda: _person(rng, roster, strangers)  # noqa: E731
+        page += [
+            f'Bøn: {person()}',
+            f'1. Skatte i Guds ord (10 min.) {person()}',
+            f'{person()}/{person()}',
+            f'Kl. 2: {person()} ({person()})',
+            f'Læsning {person()}',
+            'Weekendmødet',
+            f'Ordstyrer: {person()}',
+            f'Vagttårnet ({person()})',
+        ]
+        if fmt in ('weekday', 'january', 'danish', 'abbrev', 'weekday_thursday') and week % 2 == 0:
+            sunday = monday + datetime.timedelta(days=6)
+            page += [f'{sunday.day:02d}/{sunday.month:02d}/{sunday.year}', f'Foredrag: {person()}']
+        if len(page) >= lines_per_page:
+            pages.append(page)
+            page = []
+            for _ in range(filler_pages):
+                pages.append([f'Sang {rng.randint(1, 150)}'] + [
+                    f'Vers {verse}: lovsang og tak for den nye dag' for verse in range(lines_per_page - 1)
+                ])
+        monday += datetime.timedelta(days=7)
+    if page:
+        pages.append(page)
+    return pages
+
+def _escape(text):
+    return text.encode('cp1252', 'replace').replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+def write_pdf(pages):
+    """Return the bytes of a minimal PDF with one text line per entry of each page."""
+    objects = [b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>']
+    content_ids = []
+    for lines in pages:
+        stream = b'BT /F1 10 Tf 14 TL 40 800 Td ' + b' '.join(
+            b'(' + _escape(line) + b") '" for line in lines
+        ) + b' ET'
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        content_ids.append(len(objects))
+    pages_id = len(objects) + len(pages) + 1
+    page_ids = []
+    for content_id in content_ids:
+        objects.append(
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] '
+            b'/Resources << /Font << /F1 1 0 R >> >> /Contents %d 0 R >>' % (pages_id, content_id)
+        )
+        page_ids.append(len(objects))
+    objects.append(
+        b'<< /Type /Pages /Kids [' + b' '.join(b'%d 0 R' % page_id for page_id in page_ids)
+        + b'] /Count %d >>' % len(page_ids)
+    )
+    objects.append(b'<< /Type /Catalog /Pages %d 0 R >>' % pages_id)
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+        len(objects) + 1, len(objects), xref
+    )
+    return bytes(output)
+
+def make_program(roster, weeks=26, seed=0, **options):
+    """Return the bytes of one synthetic program PDF (see make_program_pages)."""
+    return write_pdf(make_program_pages(roster, weeks, seed, **options))
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic roster and programs.')
+    parser.add_argument('output_dir')
+    parser.add_argument('--members', type=int, default=80)
+    parser.add_argument('--weeks', type=int, default=26, help='weeks per program')
+    parser.add_argument('--programs', type=int, default=2)
+    parser.add_argument('--filler-pages', type=int, default=1, help='song list pages after each page')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    roster = make_roster(args.members, seed=args.seed)
+    with open(os.path.join(args.output_dir, 'roster.xlsx'), 'wb') as output:
+        output.write(roster_xlsx(roster))
+    with open(os.path.join(args.output_dir, 'roster.csv'), 'wb') as output:
+        output.write(roster_csv(roster))
+    start = datetime.date(2025, 9, 1)
+    for number in range(args.programs):
+        program = make_program(
+            roster, args.weeks, args.seed + number, start=start, filler_pages=args.filler_pages
+        )
+        with open(os.path.join(args.output_dir, f'program-{number + 1}.pdf'), 'wb') as output:
+            output.write(program)
+        start += datetime.timedelta(weeks=args.weeks)
+
+if __name__ == '__main__':
+    main()
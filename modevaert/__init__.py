@@ -0,0 +1,52 @@
+"""Mødevært host scheduling: roster and program parsing, scheduling and export.
+
+The heavy dependencies (pandas, openpyxl, xlsxwriter, pyarrow, pdfplumber, numpy)
+are imported on first use, so importing the package stays cheap for the command
+line tool.
+"""
+from .backends import BACKENDS
+from .export import EXPORTERS, ScheduleTable, create_csv, create_parquet, create_xlsx, write_schedule
+from .extraction import PageTextCache
+from .incremental import ScheduleStore, ScheduleUpdate, update_schedule
+from .instrumentation import Instrumentation, enable_json_logging
+from .ledger import HostingHistory, HostingLedger
+from .matrix import AvailabilityMatrix
+from .meeting import WEEKDAY, WEEKEND, Meeting
+from .members import MemberMatcher, find_matching_member, normalize_name, parse_members
+from .program import parse_program
+from .progress import ProgramParse
+from .search import score_schedule, search_schedules
+from .schedule import STRATEGIES, SchedulingConstraints, generate_schedule
+
+__all__ = [
+    'BACKENDS',
+    'EXPORTERS',
+    'AvailabilityMatrix',
+    'HostingHistory',
+    'HostingLedger',
+    'Instrumentation',
+    'Meeting',
+    'MemberMatcher',
+    'PageTextCache',
+    'ProgramParse',
+    'STRATEGIES',
+    'ScheduleTable',
+    'ScheduleStore',
+    'ScheduleUpdate',
+    'SchedulingConstraints',
+    'WEEKDAY',
+    'WEEKEND',
+    'create_csv',
+    'create_parquet',
+    'create_xlsx',
+    'enable_json_logging',
+    'find_matching_member',
+    'generate_schedule',
+    'normalize_name',
+    'parse_members',
+    'parse_program',
+    'score_schedule',
+    'search_schedules',
+    'update_schedule',
+    'write_schedule',
+]
@@ -0,0 +1,95 @@
+"""PDF text extraction backends.
+
+Each backend turns pages of a PDF into plain text, one string per page with
+lines separated by '\\n'. pdfplumber runs a full character layout analysis;
+pypdfium2 reads PDFium's text layer and is many times faster, which is all
+the line-oriented program parser needs. 'auto' uses pypdfium2 and lets
+parse_program fall back to pdfplumber for programs in which it finds no
+meeting dates.
+"""
+import os
+import threading
+from io import BytesIO
+
+AUTO = 'auto'
+FALLBACK_BACKEND = 'pdfplumber'
+
+class PdfplumberBackend:
+    """pdfplumber's layout-aware extract_text(); the original behaviour."""
+
+    name = 'pdfplumber'
+    # Slow enough that a text-layer pass to skip irrelevant pages pays off (see prefilter)
+    layout_analysis = True
+
+    def iter_page_texts(self, pdf_bytes, pages=None):
+        """Yield the text of the given page indices (all pages if None), in order."""
+        import pdfplumber
+
+        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+            selected = pdf.pages if pages is None else [pdf.pages[idx] for idx in pages]
+            for page in selected:
+                text = page.extract_text() or ''
+                # Release the cached layout objects before the next page is read
+                page.close()
+                yield text
+
+    def count_pages(self, pdf_bytes):
+        import pdfplumber
+
+        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+            return len(pdf.pages)
+
+# PDFium is not thread-safe, and Streamlit serves every session from its own thread
+_pdfium_lock = threading.RLock()
+
+class PdfiumBackend:
+    """PDFium's text layer through pypdfium2."""
+
+    name = 'pypdfium2'
+    layout_analysis = False
+
+    def iter_page_texts(self, pdf_bytes, pages=None):
+        """Yield the text of the given page indices (all pages if None), in order."""
+        import pypdfium2
+
+        with _pdfium_lock:
+            document = pypdfium2.PdfDocument(pdf_bytes)
+        try:
+            for index in range(len(document)) if pages is None else pages:
+                with _pdfium_lock:
+                    page = document[index]
+                    textpage = page.get_textpage()
+                    text = textpage.get_text_range()
+                    textpage.close()
+                    page.close()
+                yield '\n'.join(line.strip() for line in text.splitlines()).strip()
+        finally:
+            with _pdfium_lock:
+                document.close()
+
+    def count_pages(self, pdf_bytes):
+        import pypdfium2
+
+        with _pdfium_lock:
+            document = pypdfium2.PdfDocument(pdf_bytes)
+            try:
+                return len(document)
+            finally:
+                document.close()
+
+BACKENDS = {backend.name: backend for backend in (PdfplumberBackend, PdfiumBackend)}
+
+# Backend used when none is given: 'auto', 'pdfplumber' or 'pypdfium2'
+DEFAULT_BACKEND = os.environ.get('MODEVAERT_PDF_BACKEND', AUTO)
+
+def resolve_backend(backend=None):
+    """Return the name of the backend to extract with first; 'auto' picks the fast one."""
+    backend = backend or DEFAULT_BACKEND
+    if backend == AUTO:
+        return PdfiumBackend.name
+    if backend not in BACKENDS:
+        raise ValueError(f'unknown PDF backend: {backend!r}')
+    return backend
+
+def get_backend(name):
+    return BACKENDS[name]()
@@ -0,0 +1,202 @@
+"""Batch generation of host schedules for many congregations.
+
+    python -m modevaert CONGREGATIONS_DIR [--output-dir DIR] [--workers N]
+
+Each subdirectory of CONGREGATIONS_DIR is one congregation and holds its
+roster (.xlsx or .csv) and any number of program PDFs. With --ledger,
+schedules of earlier periods exported as .xlsx can be put in its history/
+subdirectory to seed the hosting ledger. The schedule of each
+congregation is written to <output-dir>/<congregation>.xlsx (or .csv/.parquet
+with --format).
+"""
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import sys
+
+from .backends import AUTO, BACKENDS, DEFAULT_BACKEND
+from .export import EXPORTERS, write_schedule
+from .extraction import CACHE_DIR, PageTextCache
+from .incremental import ScheduleStore, update_schedule
+from .instrumentation import Instrumentation
+from .ledger import HostingLedger
+from .members import parse_members
+from .program import parse_program
+from .schedule import STRATEGIES, SchedulingConstraints, generate_schedule
+from .search import search_schedules
+
+# Subdirectory of a congregation with exported schedules of earlier periods
+HISTORY_DIR = 'history'
+
+def find_congregations(root):
+    """Return (name, path) for each congregation directory in root."""
+    return sorted(
+        (entry.name, entry.path) for entry in os.scandir(root)
+        if entry.is_dir() and not entry.name.startswith('.')
+    )
+
+def build_schedule(congregation_dir, output_path, cache_dir=None, strategy='fair', constraints=None,
+                   candidates=1, time_budget=None, state_dir=None, backend=None, ledger_dir=None):
+    """Generate and write the schedule of one congregation.
+
+    With state_dir the congregation is rescheduled incrementally against the
+    schedule stored there by the previous run (see update_schedule). With
+    ledger_dir the schedule carries on from the congregation's hostings in
+    the ledger there and is recorded in it (see HostingLedger); exported
+    schedules in the congregation's history/ subdirectory are imported first.
+    Returns (meeting count, instrumentation report).
+    """
+    files = sorted(entry.path for entry in os.scandir(congregation_dir) if entry.is_file())
+    rosters = [path for path in files if path.lower().endswith(('.xlsx', '.csv'))]
+    pdf_paths = [path for path in files if path.lower().endswith('.pdf')]
+    if len(rosters) != 1:
+        raise ValueError(f'expected one roster (.xlsx or .csv), found {len(rosters)}')
+
+    name = os.path.basename(os.path.normpath(congregation_dir))
+    run = Instrumentation(name)
+    with run.stage('parse_members'):
+        members, availability = parse_members(rosters[0])
+    cache = PageTextCache(cache_dir) if cache_dir else None
+    ledger = HostingLedger(ledger_dir) if ledger_dir else None
+    history = None
+    history_dir = os.path.join(congregation_dir, HISTORY_DIR)
+    if ledger is not None and os.path.isdir(history_dir):
+        with run.stage('import_ledger'):
+            for entry in sorted(os.scandir(history_dir), key=lambda entry: entry.name):
+                if entry.is_file() and entry.name.lower().endswith('.xlsx'):
+                    ledger.import_xlsx(name, entry.path)
+    if state_dir:
+        store = ScheduleStore(state_dir)
+        if ledger is not None:
+            # update_schedule pins the stored schedule's hosts; history must end where it starts
+            start = store.start_date(os.path.abspath(congregation_dir)) or datetime.date.today()
+            history = ledger.history(name, start)
+        with run.stage('update_schedule'):
+            update = update_schedule(
+                os.path.abspath(congregation_dir), pdf_paths, members, availability,
+                store, strategy, constraints, cache=cache, workers=1,
+                candidates=candidates, time_budget=time_budget, backend=backend, stats=run.counters,
+                history=history
+            )
+        meetings, schedule = update.meetings, update.schedule
+    else:
+        with run.stage('parse_program'):
+            # Congregations already run in parallel, so each one extracts its PDFs serially
+            meetings = parse_program(
+                pdf_paths, members, cache=cache, workers=1, backend=backend,
+                stats=run.counters, file_stats=run.files
+            )
+        with run.stage('generate_schedule'):
+            if ledger is not None and meetings:
+                history = ledger.history(name, meetings[0].date)
+            if candidates > 1:
+                # Likewise the candidate schedules are searched in this process
+                schedule, _ = search_schedules(
+                    members, meetings, availability, constraints, candidates, workers=1,
+                    time_budget=time_budget, history=history
+                )
+            else:
+                schedule = generate_schedule(
+                    members, meetings, availability, strategy, constraints, history=history
+                )
+    if ledger is not None:
+        with run.stage('record_ledger'):
+            ledger.record(name, schedule)
+    with run.stage('write_schedule'):
+        write_schedule(schedule, output_path)
+    return len(meetings), run.finish()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m modevaert',
+        description='Generate host schedules for every congregation in a directory.'
+    )
+    parser.add_argument('root', help='directory with one subdirectory per congregation')
+    parser.add_argument(
+        '-o', '--output-dir',
+        help='where to write <congregation>.xlsx (default: the congregations directory)'
+    )
+    parser.add_argument(
+        '--format', choices=sorted(EXPORTERS), default='xlsx',
+        help='output format; xlsx includes per-member and per-month sheets (default: xlsx)'
+    )
+    parser.add_argument(
+        '-w', '--workers', type=int, default=os.cpu_count() or 1,
+        help='number of congregations processed in parallel (default: number of CPU cores)'
+    )
+    parser.add_argument('--no-cache', action='store_true', help='do not use the page text cache')
+    parser.add_argument(
+        '--strategy', choices=sorted(STRATEGIES), default='fair', help='host selection strategy'
+    )
+    parser.add_argument(
+        '--min-spacing', type=int, default=0, metavar='DAYS',
+        help='minimum number of days between two hostings by the same member'
+    )
+    parser.add_argument(
+        '--max-per-month', type=int, metavar='N', help='maximum hostings per member per month'
+    )
+    parser.add_argument(
+        '--candidates', type=int, default=1, metavar='K',
+        help='search K candidate schedules and keep the best scoring one (overrides --strategy)'
+    )
+    parser.add_argument(
+        '--time-budget', type=float, metavar='SECONDS',
+        help='stop the candidate search of each congregation after this many seconds'
+    )
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help='keep the hosts of past and unchanged meetings from the previous run '
+             'and only parse new or changed PDFs'
+    )
+    parser.add_argument(
+        '--ledger', action='store_true',
+        help='carry fairness over from earlier periods recorded in the hosting ledger and '
+             'record this schedule in it; exported schedules in <congregation>/history/ are imported first'
+    )
+    parser.add_argument(
+        '--pdf-backend', choices=[AUTO, *sorted(BACKENDS)], default=DEFAULT_BACKEND,
+        help='PDF text extraction backend; auto uses pypdfium2 and falls back to pdfplumber '
+             'for programs without recognizable dates (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--stats', action='store_true',
+        help='print per-stage timings and per-PDF counters of each congregation as JSON on stderr'
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        congregations = find_congregations(args.root)
+    except OSError as exc:
+        parser.error(str(exc))
+    output_dir = args.output_dir or args.root
+    os.makedirs(output_dir, exist_ok=True)
+    cache_dir = None if args.no_cache else CACHE_DIR
+    constraints = SchedulingConstraints(
+        min_spacing_days=args.min_spacing, max_per_month=args.max_per_month
+    )
+
+    failures = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {
+            executor.submit(
+                build_schedule, path, os.path.join(output_dir, f'{name}.{args.format}'),
+                cache_dir, args.strategy, constraints, args.candidates, args.time_budget,
+                CACHE_DIR if args.incremental else None, args.pdf_backend,
+                CACHE_DIR if args.ledger else None
+            ): name
+            for name, path in congregations
+        }
+        for future in concurrent.futures.as_completed(futures):
+            name = futures[future]
+            try:
+                meeting_count, report = future.result()
+            except Exception as exc:
+                failures += 1
+                print(f'{name}: failed: {exc}', file=sys.stderr)
+            else:
+                print(f'{name}: {meeting_count} meeting(s)')
+                if args.stats:
+                    print(json.dumps(report, ensure_ascii=False), file=sys.stderr)
+    return 1 if failures else 0
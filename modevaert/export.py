@@ -0,0 +1,134 @@
+"""Export of generated schedules.
+
+A ScheduleTable holds the schedule as plain columns once; the app shows it
+with st.dataframe and every exporter reads from it. The XLSX writer streams
+rows straight to xlsxwriter in constant_memory mode, so long multi-year
+schedules do not build a DataFrame or keep the sheets in memory.
+"""
+import collections
+import csv
+from io import BytesIO, StringIO
+
+from .meeting import DANISH_MONTHS, WEEKEND
+from .schedule import NO_HOST
+
+COLUMNS = ('Dato', 'Vært 1', 'Vært 2')
+
+# Same look as the header pandas' ExcelWriter used to write
+HEADER_FORMAT = {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}
+
+class ScheduleTable:
+    """A schedule as the columns Dato, Vært 1 and Vært 2, in date order."""
+
+    def __init__(self, schedule):
+        self.meetings = list(schedule)
+        self.columns = {
+            'Dato': [meeting.label for meeting in self.meetings],
+            'Vært 1': [hosts[0] for hosts in schedule.values()],
+            'Vært 2': [hosts[1] for hosts in schedule.values()],
+        }
+
+    def __len__(self):
+        return len(self.meetings)
+
+    def rows(self):
+        return zip(*(self.columns[column] for column in COLUMNS))
+
+    def hostings(self):
+        """Yield (member, meeting) for every assigned host, in date order."""
+        for meeting, first, second in zip(self.meetings, self.columns['Vært 1'], self.columns['Vært 2']):
+            for member in (first, second):
+                if member != NO_HOST:
+                    yield member, meeting
+
+    def member_rows(self):
+        """Rows of the per-member sheet: (member, date label, meeting type), by member then date."""
+        by_member = collections.defaultdict(list)
+        for member, meeting in self.hostings():
+            by_member[member].append(meeting)
+        for member in sorted(by_member):
+            for meeting in by_member[member]:
+                yield member, meeting.label, 'Weekend' if meeting.kind == WEEKEND else 'Hverdag'
+
+    def month_rows(self):
+        """Rows of the per-month sheet: (month, member, hostings), by month then member."""
+        counts = collections.Counter(
+            ((meeting.date.year, meeting.date.month), member) for member, meeting in self.hostings()
+        )
+        for ((year, month), member), count in sorted(counts.items()):
+            yield f'{DANISH_MONTHS[month - 1]} {year}', member, count
+
+def _as_table(schedule):
+    return schedule if isinstance(schedule, ScheduleTable) else ScheduleTable(schedule)
+
+def _write_sheet(workbook, name, header, rows, widths):
+    sheet = workbook.add_worksheet(name)
+    header_format = workbook.add_format(HEADER_FORMAT)
+    for col, width in enumerate(widths):
+        sheet.set_column(col, col, width)
+    sheet.write_row(0, 0, header, header_format)
+    # constant_memory flushes each row once the next one starts, so rows go strictly in order
+    for row_number, row in enumerate(rows, 1):
+        sheet.write_row(row_number, 0, row)
+
+def create_xlsx(schedule, output=None, summaries=True):
+    """Write the schedule as an Excel workbook.
+
+    schedule: a schedule dict or a ScheduleTable.
+    output: a path or binary file object; defaults to a new BytesIO, which is
+    returned rewound.
+    summaries: add the 'Pr. mødevært' and 'Pr. måned' sheets after 'Tidsplan'.
+    """
+    import xlsxwriter
+
+    table = _as_table(schedule)
+    target = BytesIO() if output is None else output
+    workbook = xlsxwriter.Workbook(target, {'constant_memory': True})
+    try:
+        _write_sheet(workbook, 'Tidsplan', COLUMNS, table.rows(), (26, 24, 24))
+        if summaries:
+            _write_sheet(
+                workbook, 'Pr. mødevært', ('Mødevært', 'Dato', 'Møde'), table.member_rows(), (24, 26, 10)
+            )
+            _write_sheet(
+                workbook, 'Pr. måned', ('Måned', 'Mødevært', 'Værtskaber'), table.month_rows(), (16, 24, 12)
+            )
+    finally:
+        workbook.close()
+    if output is None:
+        target.seek(0)
+    return target
+
+def create_csv(schedule):
+    """The 'Tidsplan' sheet as CSV in a BytesIO; UTF-8 with BOM so Excel shows æ, ø and å."""
+    table = _as_table(schedule)
+    text = StringIO()
+    writer = csv.writer(text)
+    writer.writerow(COLUMNS)
+    writer.writerows(table.rows())
+    return BytesIO(text.getvalue().encode('utf-8-sig'))
+
+def create_parquet(schedule):
+    """The 'Tidsplan' sheet as a Parquet file in a BytesIO (needs pyarrow)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = _as_table(schedule)
+    output = BytesIO()
+    pq.write_table(pa.table({column: table.columns[column] for column in COLUMNS}), output)
+    output.seek(0)
+    return output
+
+EXPORTERS = {'xlsx': create_xlsx, 'csv': create_csv, 'parquet': create_parquet}
+
+def write_schedule(schedule, path):
+    """Write the schedule to path in the format named by its extension (.xlsx, .csv or .parquet)."""
+    extension = path.rsplit('.', 1)[-1].lower()
+    if extension not in EXPORTERS:
+        raise ValueError(f'unsupported export format: .{extension}')
+    if extension == 'xlsx':
+        # Stream the workbook straight to disk
+        create_xlsx(schedule, path)
+        return
+    with open(path, 'wb') as output:
+        output.write(EXPORTERS[extension](schedule).getvalue())
@@ -0,0 +1,254 @@
+"""PDF text extraction with a persistent page-text cache and a process pool."""
+import contextlib
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from .backends import FALLBACK_BACKEND, PdfiumBackend, get_backend, resolve_backend
+from .pool import DEFAULT_WORKERS, get_process_pool
+from .prefilter import PREFILTER, relevant_pages
+
+# Extracted PDF text is cached on disk so it survives restarts and is shared by all sessions
+CACHE_DIR = os.environ.get(
+    'MODEVAERT_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'modevaert')
+)
+CACHE_MAX_BYTES = int(os.environ.get('MODEVAERT_CACHE_MAX_MB', '256')) * 1024 * 1024
+
+@contextlib.contextmanager
+def sqlite_connection(path):
+    """A connection to the SQLite database at path, committed on success and always closed.
+
+    One short-lived connection per use keeps the stores safe to share between
+    threads; WAL lets readers proceed while another connection writes.
+    """
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+class PageTextCache:
+    """Persistent, size-capped LRU cache of extracted PDF page text.
+
+    Entries are keyed by the SHA-256 of the PDF bytes and the extraction backend
+    (see page_text_key) and stored in a SQLite database, so a known program
+    costs a hash and a lookup instead of a parse.
+    When the stored text exceeds max_bytes the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.path = os.path.join(directory, 'page_text.sqlite3')
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        with sqlite_connection(self.path) as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS pages ('
+                'key TEXT PRIMARY KEY, pages TEXT NOT NULL, '
+                'size INTEGER NOT NULL, last_used REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS pages_last_used ON pages (last_used)')
+
+    def get(self, key):
+        """Return the cached list of page texts for key, or None on a miss."""
+        try:
+            with sqlite_connection(self.path) as conn:
+                row = conn.execute('SELECT pages FROM pages WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute('UPDATE pages SET last_used = ? WHERE key = ?', (time.time(), key))
+        except sqlite3.Error:
+            return None
+        return json.loads(row[0])
+
+    def put(self, key, pages):
+        """Store the page texts for key and evict old entries beyond the size cap.
+
+        Texts larger than the whole cap are not stored, as they would evict
+        everything else and then themselves.
+        """
+        payload = json.dumps(pages, ensure_ascii=False)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        try:
+            with sqlite_connection(self.path) as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO pages (key, pages, size, last_used) VALUES (?, ?, ?, ?)',
+                    (key, payload, size, time.time())
+                )
+                conn.execute(
+                    'DELETE FROM pages WHERE key IN ('
+                    'SELECT key FROM (SELECT key, SUM(size) OVER '
+                    '(ORDER BY last_used DESC, key) AS running FROM pages) '
+                    'WHERE running > ?)',
+                    (self.max_bytes,)
+                )
+        except sqlite3.Error:
+            # A read-only or locked cache must never break parsing
+            pass
+
+def read_file_bytes(uploaded_file):
+    """Return the raw bytes of an uploaded file, file-like object or path."""
+    if isinstance(uploaded_file, (str, os.PathLike)):
+        with open(uploaded_file, 'rb') as file:
+            return file.read()
+    if hasattr(uploaded_file, 'getvalue'):
+        return uploaded_file.getvalue()
+    return uploaded_file.read()
+
+def iter_page_texts(pdf_bytes, pages=None, backend=FALLBACK_BACKEND):
+    """Yield the text of the given pages (all if None) one page at a time.
+
+    Each page is extracted once and released before the next page is read,
+    so memory stays flat for long programs.
+    """
+    return get_backend(backend).iter_page_texts(pdf_bytes, pages)
+
+# The PDF a pool worker read last, as (path, bytes); its next page range is usually from the same file
+_worker_pdf = (None, None)
+
+def _extract_pages(path, pages, backend):
+    """Extract the text of the given pages of the PDF at path; runs inside pool workers."""
+    global _worker_pdf
+    if _worker_pdf[0] != path:
+        _worker_pdf = (path, read_file_bytes(path))
+    return list(iter_page_texts(_worker_pdf[1], pages, backend))
+
+def _spool_pdf(pdf_bytes):
+    """Write a PDF to a temporary file for the pool workers; returns its path."""
+    fd, path = tempfile.mkstemp(prefix='modevaert-', suffix='.pdf')
+    with os.fdopen(fd, 'wb') as file:
+        file.write(pdf_bytes)
+    return path
+
+def _remove_when_done(path, futures):
+    """Delete the temporary file at path once all futures reading it have finished."""
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def done(_future):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        with contextlib.suppress(OSError):
+            os.remove(path)
+
+    for future in futures:
+        future.add_done_callback(done)
+
+def _with_skipped_pages(texts, page_count, pages):
+    """Yield page_count texts, taking the kept pages from texts and '' for the others."""
+    if pages is None:
+        yield from texts
+        return
+    texts = iter(texts)
+    kept = set(pages)
+    for idx in range(page_count):
+        yield next(texts) if idx in kept else ''
+
+def _cached_as_consumed(key, texts, cache):
+    pages = []
+    for text in texts:
+        pages.append(text)
+        yield text
+    if cache is not None:
+        cache.put(key, pages)
+
+def _futures_results(page_futures):
+    for future in page_futures:
+        yield from future.result()
+
+def page_text_key(pdf_bytes, backend, prefiltered=False):
+    """Cache key of a PDF's page texts; backends lay text out differently, so each has its own."""
+    key = f'{hashlib.sha256(pdf_bytes).hexdigest()}:{backend}'
+    return f'{key}:prefiltered' if prefiltered else key
+
+def plan_pages(pdf_bytes, stats=None):
+    """Scan the PDFium text layer and return (page count, pages worth a layout pass).
+
+    The page list is None (extract everything) when the scan finds no date
+    header at all, e.g. when the text layer of this PDF is unusable.
+    """
+    texts = list(get_backend(PdfiumBackend.name).iter_page_texts(pdf_bytes))
+    pages = relevant_pages(texts)
+    if not pages:
+        return len(texts), None
+    if stats is not None:
+        stats['pages_not_extracted'] += len(texts) - len(pages)
+    return len(texts), pages
+
+def iter_all_page_texts(pdf_blobs, cache=None, workers=None, backend=None, prefilter=PREFILTER,
+                        stats=None):
+    """Yield, for each PDF in input order, an iterator over its page texts.
+
+    Cached PDFs are served from the cache. With a single worker the remaining
+    PDFs are streamed page by page as the iterators are consumed. Otherwise they
+    are split into page ranges that are extracted in parallel by up to `workers`
+    processes and handed back in file and page order. Each PDF is written to a
+    temporary file once and the tasks only carry its path, so the file is not
+    pickled into every page range. Fully consumed PDFs are added to the cache.
+    backend: a name from BACKENDS or 'auto' (see backends.resolve_backend).
+    prefilter: for layout backends, scan the fast text layer first and only
+    extract the pages prefilter.relevant_pages keeps; the others come back as ''.
+    stats: optional Counter; 'pages_not_extracted' counts the pages skipped that way.
+    """
+    if workers is None:
+        workers = DEFAULT_WORKERS
+    backend = resolve_backend(backend)
+    prefilter = prefilter and get_backend(backend).layout_analysis
+    keys = [page_text_key(pdf_bytes, backend, prefilter) for pdf_bytes in pdf_blobs]
+    cached = [cache.get(key) if cache is not None else None for key in keys]
+    missing = [idx for idx, pages in enumerate(cached) if pages is None]
+
+    plans = {}
+    if prefilter:
+        plans = {idx: plan_pages(pdf_blobs[idx], stats) for idx in missing}
+
+    futures = {}
+    if workers > 1 and missing:
+        for idx in missing:
+            if idx not in plans:
+                plans[idx] = (get_backend(backend).count_pages(pdf_blobs[idx]), None)
+        to_extract = {
+            idx: list(range(page_count)) if pages is None else pages
+            for idx, (page_count, pages) in plans.items()
+        }
+        total_pages = sum(len(pages) for pages in to_extract.values())
+        # Aim for a couple of tasks per worker so uneven pages still balance out
+        chunk_size = max(1, math.ceil(total_pages / (workers * 2)))
+        executor = get_process_pool(workers)
+        for idx, pages in to_extract.items():
+            if not pages:
+                continue
+            path = _spool_pdf(pdf_blobs[idx])
+            submitted = []
+            try:
+                for start in range(0, len(pages), chunk_size):
+                    submitted.append(
+                        executor.submit(_extract_pages, path, pages[start:start + chunk_size], backend)
+                    )
+            finally:
+                if submitted:
+                    _remove_when_done(path, submitted)
+                else:
+                    os.remove(path)
+            futures[idx] = submitted
+
+    for idx, pdf_bytes in enumerate(pdf_blobs):
+        if cached[idx] is not None:
+            yield iter(cached[idx])
+            continue
+        page_count, pages = plans.get(idx, (None, None))
+        if idx in futures:
+            texts = _futures_results(futures[idx])
+        else:
+            texts = iter_page_texts(pdf_bytes, pages, backend)
+        yield _cached_as_consumed(keys[idx], _with_skipped_pages(texts, page_count, pages), cache)
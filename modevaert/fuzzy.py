@@ -0,0 +1,151 @@
+"""Approximate name lookup for misspelled program names.
+
+Names are folded (lower case, single spaces, diacritics removed, Danish
+letters spelled out in ASCII) before they are compared, so "Rüdinger",
+"Rudinger" and "RÜDINGER" are the same name. A FuzzyIndex keeps the
+character trigrams of every folded roster name in an inverted index; a
+lookup counts the trigrams each name shares with the query in one NumPy
+pass and only verifies the few names that share enough of them to be
+within the allowed number of edits, with a Levenshtein distance that gives
+up as soon as that number is exceeded.
+"""
+import collections
+import os
+import unicodedata
+
+def check_min_score(value, name='min_score'):
+    """Return value as a similarity threshold, raising ValueError unless it is above 0 and at most 1."""
+    try:
+        score = float(value)
+    except ValueError:
+        score = None
+    if score is None or not 0 < score <= 1:
+        raise ValueError(f'{name} must be a number above 0 and at most 1, got {value!r}')
+    return score
+
+# Lowest similarity (1 - edits / length of the longer name), above 0 and at most 1, accepted
+# as a match; 1 disables fuzzy matching
+FUZZY_MIN_SCORE = check_min_score(
+    os.environ.get('MODEVAERT_FUZZY_MIN_SCORE', '0.85'), 'MODEVAERT_FUZZY_MIN_SCORE'
+)
+
+# Letters NFKD does not decompose
+_FOLD = str.maketrans({'ø': 'o', 'æ': 'ae', 'å': 'aa', 'ß': 'ss', 'đ': 'd', 'ł': 'l', 'œ': 'oe'})
+
+FuzzyHit = collections.namedtuple('FuzzyHit', 'member score')
+
+def fold_name(name):
+    """Normalize a name as normalize_name does and reduce it to ASCII-like letters."""
+    name = ' '.join(name.split()).lower().translate(_FOLD)
+    if name.isascii():
+        return name
+    return ''.join(
+        char for char in unicodedata.normalize('NFKD', name) if not unicodedata.combining(char)
+    )
+
+def _trigrams(name):
+    padded = f'  {name} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def bounded_levenshtein(a, b, limit):
+    """Edit distance between a and b, or limit + 1 once it is certain to exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+    previous = list(range(len(a) + 1))
+    for i, char_b in enumerate(b, 1):
+        current = [i]
+        best = i
+        for j, char_a in enumerate(a, 1):
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            )
+            current.append(cost)
+            if cost < best:
+                best = cost
+        if best > limit:
+            return limit + 1
+        previous = current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+class FuzzyIndex:
+    """Trigram index over a list of names for lookups within a similarity threshold.
+
+    lookup() returns the index of the closest name, the lowest index among
+    occurrences of the same folded name, together with its similarity score.
+    Two different names equally close to the query are ambiguous, and no match
+    is returned.
+    """
+
+    def __init__(self, names, min_score=FUZZY_MIN_SCORE):
+        import numpy as np
+
+        self._np = np
+        self.min_score = check_min_score(min_score)
+        first = {}
+        for idx, name in enumerate(names):
+            first.setdefault(fold_name(name), idx)
+        # Each distinct folded name once, with the index of its first occurrence
+        self.folded = list(first)
+        self.indices = list(first.values())
+        self._lengths = np.array([len(name) for name in self.folded], dtype=np.int32)
+        postings = collections.defaultdict(list)
+        for position, name in enumerate(self.folded):
+            for gram in _trigrams(name):
+                postings[gram].append(position)
+        self._postings = {gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()}
+
+    def max_edits(self, length):
+        """The number of edits a name of this length may differ by and still reach min_score."""
+        return int((1 - self.min_score) * length + 1e-9)
+
+    def lookup(self, name):
+        """Return (index, score) of the closest name, or None if none reaches min_score."""
+        query = fold_name(name)
+        # Most edits any candidate may need: one longer than the query allows a few more
+        limit = self.max_edits(len(query) / self.min_score)
+        if not query or limit < 1:
+            return None
+        grams = _trigrams(query)
+        # One edit changes at most three trigrams of the query
+        needed = len(grams) - 3 * limit
+        if needed < 1:
+            return None
+
+        # Shared trigrams per name in one pass over the posting lists
+        postings = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not postings:
+            return None
+        np = self._np
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.folded))
+        positions = np.flatnonzero(
+            (shared >= needed) & (np.abs(self._lengths - len(query)) <= limit)
+        )
+        # Most shared trigrams first, so the closest names tend to come early
+        positions = positions[np.argsort(-shared[positions], kind='stable')]
+
+        best = None
+        ambiguous = False
+        for position, count in zip(positions.tolist(), shared[positions].tolist()):
+            if best is not None and count < len(grams) - 3 * best[0]:
+                break  # Too few shared trigrams to be as close as the best so far
+            candidate = self.folded[position]
+            # The score is relative to the longer name, so a longer candidate may allow more edits
+            allowed = self.max_edits(max(len(query), len(candidate)))
+            if best is not None:
+                allowed = min(allowed, best[0])
+            distance = bounded_levenshtein(query, candidate, allowed)
+            if distance > allowed:
+                continue
+            if best is None or distance < best[0]:
+                best = (distance, position)
+                ambiguous = False
+            else:
+                ambiguous = True
+        if best is None or ambiguous:
+            return None
+        distance, position = best
+        return self.indices[position], 1 - distance / max(len(query), len(self.folded[position]))
@@ -0,0 +1,235 @@
+"""Incremental rescheduling when new program PDFs arrive.
+
+A ScheduleStore remembers the meetings parsed from each program, keyed by
+the SHA-256 of the PDF and of the roster and by the extraction backend, and the last schedule generated
+under a name (a congregation or roster file). update_schedule then parses
+only new or changed PDFs and re-solves only the dates from the first
+affected future meeting onwards; earlier hosts, which are already announced,
+stay pinned.
+"""
+import collections
+import dataclasses
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from .backends import DEFAULT_BACKEND
+from .extraction import CACHE_DIR, read_file_bytes, sqlite_connection
+from .fuzzy import FUZZY_MIN_SCORE, FuzzyHit
+from .meeting import WEEKEND, Meeting
+from .members import MemberMatcher
+from .program import merge_program_meetings, parse_program_files
+from .schedule import NO_HOST, SchedulingConstraints, generate_schedule
+from .search import search_schedules
+
+ScheduleUpdate = collections.namedtuple(
+    'ScheduleUpdate', 'meetings schedule parsed_files resolved_meetings fuzzy_hits'
+)
+
+class ScheduleStore:
+    """SQLite store of parsed programs and of the last schedule per name."""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.path = os.path.join(directory, 'schedules.sqlite3')
+        os.makedirs(directory, exist_ok=True)
+        with sqlite_connection(self.path) as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS programs ('
+                'key TEXT PRIMARY KEY, meetings TEXT NOT NULL, last_used REAL NOT NULL)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS schedules ('
+                'name TEXT PRIMARY KEY, settings TEXT NOT NULL, '
+                'schedule TEXT NOT NULL, updated REAL NOT NULL)'
+            )
+
+    def get_program(self, key):
+        """Return the stored (meetings, fuzzy hits) of a program, or None.
+
+        meetings: dict (date, kind) -> set of assigned members.
+        fuzzy hits: dict pdf_name -> FuzzyHit of its names matched as a misspelling.
+        """
+        try:
+            with sqlite_connection(self.path) as conn:
+                row = conn.execute('SELECT meetings FROM programs WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute('UPDATE programs SET last_used = ? WHERE key = ?', (time.time(), key))
+        except sqlite3.Error:
+            return None
+        payload = json.loads(row[0])
+        if isinstance(payload, list):
+            # Stored before fuzzy hits were kept; parsing it again stores them
+            return None
+        meetings = {
+            (datetime.date.fromisoformat(date), kind): set(assigned)
+            for date, kind, assigned in payload['meetings']
+        }
+        fuzzy_hits = {pdf_name: FuzzyHit(member, score) for pdf_name, member, score in payload['fuzzy_hits']}
+        return meetings, fuzzy_hits
+
+    def put_program(self, key, meetings, fuzzy_hits=None):
+        payload = json.dumps({
+            'meetings': [
+                [date.isoformat(), kind, sorted(assigned)] for (date, kind), assigned in meetings.items()
+            ],
+            'fuzzy_hits': [[pdf_name, *hit] for pdf_name, hit in sorted((fuzzy_hits or {}).items())],
+        }, ensure_ascii=False)
+        try:
+            with sqlite_connection(self.path) as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO programs (key, meetings, last_used) VALUES (?, ?, ?)',
+                    (key, payload, time.time())
+                )
+        except sqlite3.Error:
+            # Parsed programs are only a cache; losing one costs a re-parse
+            pass
+
+    def get_schedule(self, name):
+        """Return (settings, schedule) stored under name, or (None, {})."""
+        with sqlite_connection(self.path) as conn:
+            row = conn.execute(
+                'SELECT settings, schedule FROM schedules WHERE name = ?', (name,)
+            ).fetchone()
+        if row is None:
+            return None, {}
+        schedule = {
+            Meeting(datetime.date.fromisoformat(date), kind, assignees): tuple(hosts)
+            for date, kind, assignees, hosts in json.loads(row[1])
+        }
+        return row[0], schedule
+
+    def start_date(self, name):
+        """Date of the first meeting of the schedule stored under name, or None."""
+        with sqlite_connection(self.path) as conn:
+            row = conn.execute('SELECT schedule FROM schedules WHERE name = ?', (name,)).fetchone()
+        meetings = json.loads(row[0]) if row else []
+        return min((datetime.date.fromisoformat(date) for date, *_ in meetings), default=None)
+
+    def put_schedule(self, name, settings, schedule):
+        payload = json.dumps(
+            [
+                [meeting.date.isoformat(), meeting.kind, sorted(meeting.assignees), list(hosts)]
+                for meeting, hosts in schedule.items()
+            ],
+            ensure_ascii=False
+        )
+        with sqlite_connection(self.path) as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO schedules (name, settings, schedule, updated) '
+                'VALUES (?, ?, ?, ?)',
+                (name, settings, payload, time.time())
+            )
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+def _settings_key(members, availability, strategy, constraints):
+    """Everything besides the meetings that decides the schedule; a change re-solves all future dates."""
+    return json.dumps({
+        'members': list(members),
+        'availability': sorted(availability.items()),
+        'strategy': strategy,
+        'constraints': dataclasses.asdict(constraints),
+    }, ensure_ascii=False, sort_keys=True, default=str)
+
+def _still_valid(meeting, hosts, roster, availability):
+    """Whether previously chosen hosts are still allowed for the (unchanged) meeting."""
+    if NO_HOST in hosts:
+        return False
+    for member in hosts:
+        if member not in roster or member in meeting.assignees:
+            return False
+        if meeting.kind != WEEKEND and availability.get(member) == 'sunday_only':
+            return False
+    return True
+
+def first_affected_date(meetings, previous, today, roster, availability):
+    """Date of the first meeting from today on whose hosts have to be chosen again, or None.
+
+    That is the first future meeting that is new, changed, dropped from the
+    programs or whose previous hosts are no longer allowed.
+    """
+    current = {(meeting.date, meeting.kind): meeting for meeting in meetings}
+    previous_by_key = {(meeting.date, meeting.kind): (meeting, hosts) for meeting, hosts in previous.items()}
+    for key in sorted(set(current) | set(previous_by_key)):
+        if key[0] < today:
+            continue
+        meeting = current.get(key)
+        old_meeting, hosts = previous_by_key.get(key, (None, None))
+        if (meeting is None or old_meeting is None or meeting.assignees != old_meeting.assignees
+                or not _still_valid(meeting, hosts, roster, availability)):
+            return key[0]
+    return None
+
+def update_schedule(name, uploaded_files, members, availability=None, store=None, strategy='fair',
+                    constraints=None, today=None, cache=None, workers=None, candidates=1,
+                    time_budget=None, backend=None, stats=None, history=None):
+    """Parse new or changed programs and re-solve only the affected future dates.
+
+    Meetings before today keep their stored hosts, as do future meetings up to
+    the first one that changed (see first_affected_date). Strategy, constraint
+    and roster changes re-solve every date from today on. With candidates > 1
+    the re-solved part is picked by search_schedules.
+    Returns a ScheduleUpdate with all meetings, the full schedule, the number
+    of PDFs actually parsed, the number of meetings whose hosts were chosen and
+    the names matched as misspellings in all programs, parsed now or earlier
+    (pdf_name -> FuzzyHit, see MemberMatcher).
+    stats: optional Counter of page counts for the parsed PDFs, as for parse_program.
+    history: optional HostingHistory of earlier periods, as for generate_schedule.
+    """
+    availability = availability or {}
+    constraints = constraints or SchedulingConstraints()
+    store = store or ScheduleStore()
+    today = today or datetime.date.today()
+
+    backend = backend or DEFAULT_BACKEND
+    roster_key = _digest('\n'.join(members).encode('utf-8'))
+    # The fuzzy threshold decides which misspelled names count as members
+    keys = [
+        f'{_digest(read_file_bytes(uploaded_file))}:{roster_key}:{backend}:{FUZZY_MIN_SCORE}'
+        for uploaded_file in uploaded_files
+    ]
+    per_file = [store.get_program(key) for key in keys]
+    missing = [idx for idx, program in enumerate(per_file) if program is None]
+    if missing:
+        matcher = MemberMatcher(members)
+        blobs = [read_file_bytes(uploaded_files[idx]) for idx in missing]
+        file_hits = []
+        for idx, meetings in zip(missing, parse_program_files(
+            blobs, matcher, cache, workers, backend, stats, file_hits=file_hits
+        )):
+            store.put_program(keys[idx], meetings, file_hits[-1])
+            per_file[idx] = meetings, file_hits[-1]
+    meetings = merge_program_meetings(meetings for meetings, _ in per_file)
+    fuzzy_hits = {}
+    for _, hits in per_file:
+        fuzzy_hits.update(hits)
+
+    settings = _settings_key(members, availability, strategy, constraints)
+    previous_settings, previous = store.get_schedule(name)
+    if previous_settings == settings:
+        cutoff = first_affected_date(meetings, previous, today, set(members), availability)
+    else:
+        cutoff = today
+    hosts_by_key = {(meeting.date, meeting.kind): hosts for meeting, hosts in previous.items()}
+    pinned = {
+        meeting: hosts_by_key[meeting.date, meeting.kind]
+        for meeting in meetings
+        if (cutoff is None or meeting.date < cutoff) and (meeting.date, meeting.kind) in hosts_by_key
+    }
+
+    if candidates > 1:
+        schedule, _ = search_schedules(
+            members, meetings, availability, constraints, candidates,
+            workers=workers, time_budget=time_budget, pinned=pinned, history=history
+        )
+    else:
+        schedule = generate_schedule(
+            members, meetings, availability, strategy, constraints, pinned=pinned, history=history
+        )
+    store.put_schedule(name, settings, schedule)
+    return ScheduleUpdate(meetings, schedule, len(missing), len(meetings) - len(pinned), fuzzy_hits)
@@ -0,0 +1,118 @@
+"""Per-run instrumentation: stage timings, memory peaks, per-PDF counters.
+
+An Instrumentation collects one report per run:
+
+    run = Instrumentation()
+    with run.stage('parse_members'):
+        members, availability = parse_members(roster)
+    with run.stage('parse_program'):
+        meetings = parse_program(pdfs, members, stats=run.counters, file_stats=run.files)
+    run.finish()
+
+Each stage records wall time, CPU time of the process (all its threads, so
+in the app also other sessions running at the same time; pool worker
+processes are not included) and, when memory tracing is on, the tracemalloc
+peak of the allocations made during the stage. A caller that reuses a stage's
+result from an earlier run may append that run's record with 'reused': True;
+it is reported but not counted in the total. finish() logs the report as one
+JSON line on the 'modevaert' logger and, with profiling on, writes a cProfile
+dump of the stages. Stages run one after another; they are not meant to nest.
+Tracing and profiling only run inside a stage, so a run abandoned between
+stages (an exception, st.stop(), a Streamlit rerun) leaves neither running.
+tracemalloc is process-wide, so in the app a memory peak also includes other
+sessions running at the same time.
+"""
+import cProfile
+import collections
+import contextlib
+import datetime
+import json
+import logging
+import os
+import time
+import tracemalloc
+
+logger = logging.getLogger('modevaert')
+
+# tracemalloc slows Python code down considerably, so memory tracing is opt-in
+TRACE_MEMORY = os.environ.get('MODEVAERT_TRACE_MEMORY', '0') == '1'
+# Directory for one cProfile dump per run; unset disables profiling
+PROFILE_DIR = os.environ.get('MODEVAERT_PROFILE_DIR') or None
+
+def enable_json_logging(stream=None):
+    """Send the run reports of the 'modevaert' logger to stream (stderr by default), once."""
+    if not logger.handlers:
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+class Instrumentation:
+    """Stage timings and counters of one run, see the module docstring.
+
+    counters: a Counter summed over the run, e.g. passed as parse_program's stats.
+    files: a list of per-PDF Counters, e.g. passed as parse_program's file_stats.
+    """
+
+    def __init__(self, name='run', trace_memory=TRACE_MEMORY, profile_dir=PROFILE_DIR):
+        self.name = name
+        self.trace_memory = trace_memory
+        self.profile_dir = profile_dir
+        self.stages = []
+        self.counters = collections.Counter()
+        self.files = []
+        self.profile_path = None
+        # Collects the stages; enabled only while one runs
+        self._profiler = cProfile.Profile() if profile_dir else None
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time the enclosed block as one stage of the run."""
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+        if self._profiler is not None:
+            self._profiler.enable()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                'stage': name,
+                'wall_s': time.perf_counter() - wall,
+                'cpu_s': time.process_time() - cpu,
+            }
+            if self._profiler is not None:
+                self._profiler.disable()
+            if self.trace_memory:
+                record['peak_kib'] = tracemalloc.get_traced_memory()[1] // 1024
+                if started_tracing:
+                    tracemalloc.stop()
+            self.stages.append(record)
+
+    def report(self):
+        """The run as a JSON-serializable dict."""
+        return {
+            'run': self.name,
+            'stages': self.stages,
+            'total_wall_s': sum(stage['wall_s'] for stage in self.stages if not stage.get('reused')),
+            'counters': dict(self.counters),
+            'files': [dict(counters) for counters in self.files],
+            'profile': self.profile_path,
+        }
+
+    def finish(self):
+        """Write the profile, log the report as JSON and return it."""
+        if self._profiler is not None:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            timestamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+            self.profile_path = os.path.join(self.profile_dir, f'{self.name}-{timestamp}.prof')
+            self._profiler.dump_stats(self.profile_path)
+            self._profiler = None
+        report = self.report()
+        logger.info(json.dumps(report, ensure_ascii=False))
+        return report
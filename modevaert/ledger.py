@@ -0,0 +1,106 @@
+"""A persistent ledger of who hosted which meeting, across planning periods.
+
+Every generated schedule can be recorded in a HostingLedger under a name (a
+congregation or roster file). Before the next period is scheduled, history()
+returns each member's last hosting and number of hostings in a rolling
+window before the period starts; generate_schedule seeds its fairness
+bookkeeping with them, so whoever hosted at the end of the previous period
+is not picked again right away. Past schedules exported by create_xlsx can be
+imported to seed the ledger.
+"""
+import collections
+import datetime
+import os
+from io import BytesIO
+
+from .extraction import CACHE_DIR, read_file_bytes, sqlite_connection
+from .meeting import Meeting
+from .schedule import NO_HOST
+
+# Hostings within this many days before a period count towards the members' load
+HISTORY_WINDOW_DAYS = int(os.environ.get('MODEVAERT_HISTORY_WINDOW_DAYS', '365'))
+
+HostingHistory = collections.namedtuple('HostingHistory', 'last_hosted counts')
+
+class HostingLedger:
+    """SQLite table of hostings (name, member, date, kind), indexed by member and date."""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.path = os.path.join(directory, 'ledger.sqlite3')
+        os.makedirs(directory, exist_ok=True)
+        with sqlite_connection(self.path) as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS hostings ('
+                'name TEXT NOT NULL, member TEXT NOT NULL, date TEXT NOT NULL, kind TEXT NOT NULL, '
+                'PRIMARY KEY (name, date, kind, member)) WITHOUT ROWID'
+            )
+            # Covers the per-member aggregation in history()
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS hostings_member_date ON hostings (name, member, date)'
+            )
+
+    def record(self, name, schedule):
+        """Store the hosts of every meeting in schedule, replacing earlier hosts of those meetings.
+
+        Returns the number of hostings stored.
+        """
+        meetings = [(meeting.date.isoformat(), meeting.kind) for meeting in schedule]
+        rows = [
+            (name, member, meeting.date.isoformat(), meeting.kind)
+            for meeting, hosts in schedule.items()
+            for member in hosts
+            if member != NO_HOST
+        ]
+        with sqlite_connection(self.path) as conn:
+            conn.executemany(
+                'DELETE FROM hostings WHERE name = ? AND date = ? AND kind = ?',
+                [(name, date, kind) for date, kind in meetings]
+            )
+            conn.executemany('INSERT OR IGNORE INTO hostings VALUES (?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def history(self, name, before, window_days=HISTORY_WINDOW_DAYS):
+        """Return the HostingHistory of name before the date `before`.
+
+        last_hosted: member -> date of the member's last hosting before `before`.
+        counts: member -> hostings in the window_days before `before`.
+        """
+        since = before - datetime.timedelta(days=window_days)
+        with sqlite_connection(self.path) as conn:
+            rows = conn.execute(
+                'SELECT member, MAX(date), SUM(date >= ?) FROM hostings '
+                'WHERE name = ? AND date < ? GROUP BY member',
+                (since.isoformat(), name, before.isoformat())
+            ).fetchall()
+        return HostingHistory(
+            {member: datetime.date.fromisoformat(last) for member, last, _ in rows},
+            {member: count for member, _, count in rows if count},
+        )
+
+    def import_xlsx(self, name, uploaded_file):
+        """Record a schedule exported by create_xlsx (its 'Tidsplan' sheet); returns the hostings stored."""
+        return self.record(name, read_schedule_xlsx(uploaded_file))
+
+def read_schedule_xlsx(uploaded_file):
+    """Read the dict Meeting -> (host 1, host 2) back from a workbook written by create_xlsx.
+
+    Rows whose date cell is not a meeting label are skipped.
+    """
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(
+        BytesIO(read_file_bytes(uploaded_file)), read_only=True, data_only=True
+    )
+    try:
+        sheet = workbook['Tidsplan'] if 'Tidsplan' in workbook.sheetnames else workbook.worksheets[0]
+        schedule = {}
+        for row in sheet.iter_rows(min_row=2, max_col=3, values_only=True):
+            label, first, second = (row + (None, None, None))[:3]
+            try:
+                meeting = Meeting.from_label(label)
+            except ValueError:
+                continue
+            schedule[meeting] = (first or NO_HOST, second or NO_HOST)
+        return schedule
+    finally:
+        workbook.close()
@@ -0,0 +1,81 @@
+"""Members × meetings boolean matrices for scheduling and schedule statistics."""
+from .meeting import WEEKEND
+
+class AvailabilityMatrix:
+    """Who may host which meeting, as boolean NumPy arrays.
+
+    Rows follow the roster (first occurrence of each name), columns the
+    meetings in date order.
+
+    conflicts[i, j]: member i is assigned to meeting j in the program.
+    restricted[i, j]: member i's availability rules out meeting j
+    (Sunday-only members on weekday meetings).
+    """
+
+    def __init__(self, members, meetings, availability=None):
+        import numpy as np
+
+        availability = availability or {}
+        self.members = list(dict.fromkeys(members))
+        self.meetings = sorted(meetings)
+        self.row = {member: idx for idx, member in enumerate(self.members)}
+        self.column = {meeting: idx for idx, meeting in enumerate(self.meetings)}
+
+        self.conflicts = np.zeros((len(self.members), len(self.meetings)), dtype=bool)
+        for col, meeting in enumerate(self.meetings):
+            rows = [self.row[name] for name in meeting.assignees if name in self.row]
+            self.conflicts[rows, col] = True
+
+        self.weekend = np.array([meeting.kind == WEEKEND for meeting in self.meetings], dtype=bool)
+        sunday_only = np.array(
+            [availability.get(member) == 'sunday_only' for member in self.members], dtype=bool
+        )
+        self.restricted = sunday_only[:, None] & ~self.weekend[None, :]
+
+    def available(self, respect_conflicts=True):
+        """Boolean matrix of members allowed to host each meeting."""
+        if respect_conflicts:
+            return ~(self.restricted | self.conflicts)
+        return ~self.restricted
+
+    def meetings_with_conflicts(self):
+        """Number of meetings where at least one member is busy with a program assignment."""
+        return int(self.conflicts.any(axis=0).sum())
+
+    def hosts(self, schedule):
+        """Boolean matrix marking the hosts of each meeting in a schedule."""
+        import numpy as np
+
+        hosts = np.zeros(self.conflicts.shape, dtype=bool)
+        rows, cols = [], []
+        for meeting, assigned in schedule.items():
+            col = self.column.get(meeting)
+            if col is None:
+                continue
+            for member in assigned:
+                row = self.row.get(member)
+                if row is not None:
+                    rows.append(row)
+                    cols.append(col)
+        hosts[rows, cols] = True
+        return hosts
+
+    def load(self, schedule):
+        """Hostings per member, in roster order."""
+        return self.hosts(schedule).sum(axis=1)
+
+    def load_statistics(self, schedule):
+        """Summary of how evenly a schedule spreads hostings over the roster."""
+        hosts = self.hosts(schedule)
+        load = hosts.sum(axis=1)
+        if not len(load):
+            return {'min': 0, 'max': 0, 'mean': 0.0, 'std': 0.0, 'unassigned': 0, 'violations': 0}
+        return {
+            'min': int(load.min()),
+            'max': int(load.max()),
+            'mean': float(load.mean()),
+            'std': float(load.std()),
+            'unassigned': int((hosts.sum(axis=0) < 2).sum()),
+            # Hostings the availability rules forbid; zero for schedules from generate_schedule
+            'violations': int((hosts & ~self.available()).sum()),
+        }
@@ -0,0 +1,73 @@
+"""The Meeting record passed between parsing, scheduling and export."""
+import datetime
+
+DANISH_MONTHS = [
+    'Januar', 'Februar', 'Marts', 'April', 'Maj', 'Juni',
+    'Juli', 'August', 'September', 'Oktober', 'November', 'December'
+]
+DANISH_WEEKDAYS = ['Mandag', 'Tirsdag', 'Onsdag', 'Torsdag', 'Fredag', 'Lørdag', 'Søndag']
+
+# Meeting kinds: the midweek meeting and the weekend (Sunday) meeting
+WEEKDAY = 'weekday'
+WEEKEND = 'weekend'
+
+class Meeting:
+    """One meeting: its date, its kind and the members assigned to it in the program.
+
+    Meetings compare by value and sort by date, so they can be sorted and
+    used as dict keys directly. Danish text is only produced by `label`.
+    """
+
+    __slots__ = ('date', 'kind', 'assignees')
+
+    def __init__(self, date, kind, assignees=frozenset()):
+        self.date = date
+        self.kind = kind
+        self.assignees = frozenset(assignees)
+
+    @property
+    def label(self):
+        """The meeting date as Danish text, e.g. "Søndag 07 September 2025".
+
+        The day name is the date's, unless it contradicts the kind (an assumed
+        year can put a weekday meeting on a Saturday); then it is Tirsdag for a
+        weekday meeting and Søndag for a weekend meeting, as the programs print
+        them. So from_label always gives back the kind.
+        """
+        date = self.date
+        weekday = date.weekday()
+        if (weekday >= 5) != (self.kind == WEEKEND):
+            weekday = 6 if self.kind == WEEKEND else 1
+        return (f"{DANISH_WEEKDAYS[weekday]} {date.day:02d} "
+                f"{DANISH_MONTHS[date.month - 1]} {date.year}")
+
+    @classmethod
+    def from_label(cls, label):
+        """The meeting (without assignees) of a `label`, e.g. from an exported schedule.
+
+        Lørdag and Søndag are weekend meetings, every other day name a weekday
+        meeting; the name decides, not the weekday of the date. Raises ValueError
+        for text that is not a label.
+        """
+        parts = str(label).split()
+        if len(parts) != 4 or parts[0] not in DANISH_WEEKDAYS or parts[2] not in DANISH_MONTHS:
+            raise ValueError(f'not a meeting date: {label!r}')
+        date = datetime.date(int(parts[3]), DANISH_MONTHS.index(parts[2]) + 1, int(parts[1]))
+        return cls(date, WEEKEND if DANISH_WEEKDAYS.index(parts[0]) >= 5 else WEEKDAY)
+
+    def _key(self):
+        return (self.date, self.kind, self.assignees)
+
+    def __eq__(self, other):
+        if not isinstance(other, Meeting):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __lt__(self, other):
+        return (self.date, self.kind) < (other.date, other.kind)
+
+    def __repr__(self):
+        return f'Meeting({self.date!r}, {self.kind!r}, {sorted(self.assignees)!r})'
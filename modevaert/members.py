@@ -0,0 +1,236 @@
+"""Roster loading and matching of program names against the roster."""
+import bisect
+import collections
+import csv
+import functools
+import hashlib
+import threading
+from io import BytesIO, StringIO
+
+from .extraction import read_file_bytes
+from .fuzzy import FUZZY_MIN_SCORE, FuzzyHit, FuzzyIndex, check_min_score, fold_name
+
+# Parsed rosters by SHA-256 of the file, so reruns with the same upload skip the parse
+ROSTER_CACHE_SIZE = 32
+_roster_cache = collections.OrderedDict()
+_roster_cache_lock = threading.Lock()
+
+def parse_members(uploaded_file):
+    """Parse members and optional availability notes from the roster file.
+
+    The roster is an Excel workbook (first sheet) or a CSV file.
+    Column A (from row 3) contains names.
+    Column B (optional) contains notes such as 'Sunday only'.
+    """
+    data = read_file_bytes(uploaded_file)
+    key = hashlib.sha256(data).hexdigest()
+    with _roster_cache_lock:
+        cached = _roster_cache.get(key)
+        if cached is not None:
+            _roster_cache.move_to_end(key)
+    if cached is None:
+        # xlsx files are zip archives; anything else is read as CSV
+        rows = _iter_xlsx_rows(data) if data[:2] == b'PK' else _iter_csv_rows(data)
+        cached = _parse_roster_rows(rows)
+        with _roster_cache_lock:
+            _roster_cache[key] = cached
+            while len(_roster_cache) > ROSTER_CACHE_SIZE:
+                _roster_cache.popitem(last=False)
+
+    members, availability = cached
+    return list(members), dict(availability)
+
+def _iter_xlsx_rows(data):
+    """Yield (name, note) cell values of the first sheet from row 3 on, streaming."""
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(BytesIO(data), read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        # Read-only sheets trust the stored dimension, which writers often leave stale
+        sheet.reset_dimensions()
+        for row in sheet.iter_rows(min_row=3, max_col=2, values_only=True):
+            yield (row + (None, None))[:2]
+    finally:
+        workbook.close()
+
+def _iter_csv_rows(data):
+    """Yield (name, note) values of a CSV roster from line 3 on."""
+    try:
+        text = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        # Excel on Windows saves CSV in the ANSI code page
+        text = data.decode('cp1252')
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    for line_number, row in enumerate(csv.reader(StringIO(text), dialect), 1):
+        if line_number >= 3:
+            yield (row[0] if row else None, row[1] if len(row) > 1 else None)
+
+def _parse_roster_rows(rows):
+    members = []
+    availability = {}  # name -> availability flag, e.g. 'sunday_only'
+
+    for name, note_val in rows:
+        if name is None:
+            continue
+        # Whole numbers read as floats are shown without the trailing .0, as pandas did
+        if isinstance(name, float) and name.is_integer():
+            name = int(name)
+        name_str = str(name).strip()
+        if not name_str:
+            continue
+
+        members.append(name_str)
+
+        note_flag = None
+        if isinstance(note_val, str):
+            normalized_note = note_val.strip().lower()
+            if normalized_note == "sunday only":
+                note_flag = "sunday_only"
+
+        if note_flag:
+            availability[name_str] = note_flag
+
+    return members, availability
+
+def normalize_name(name):
+    """Normalize a name for comparison by removing extra spaces and converting to lowercase"""
+    return ' '.join(name.split()).lower()
+
+class MemberMatcher:
+    """Match names found in programs against a fixed list of members.
+
+    Tries an exact match, the same name without diacritics, a member name
+    contained in the PDF name or the other way round, a misspelling of a
+    member name (see fuzzy) and finally a shared last name. The normalized
+    roster is indexed once for each step: hash maps for exact and folded
+    names, an Aho-Corasick automaton for members contained in a PDF name, the
+    joined roster for PDF names contained in a member, a trigram FuzzyIndex
+    and a word index. Results are memoized in a bounded LRU cache of
+    pdf_name → member.
+
+    fuzzy_min_score: similarity a misspelled name needs to match (1 disables).
+    fuzzy_hits: pdf_name → FuzzyHit(member, score) of every name matched as a misspelling.
+    """
+
+    def __init__(self, members_list, cache_size=4096, fuzzy_min_score=FUZZY_MIN_SCORE):
+        self.members = list(members_list)
+        normalized = [normalize_name(member) for member in self.members]
+
+        self._exact = {}
+        self._folded = {}
+        self._words = {}
+        for idx, name in enumerate(normalized):
+            self._exact.setdefault(name, idx)
+            self._folded.setdefault(fold_name(name), idx)
+            for word in name.split():
+                if len(word) > 2:  # Avoid matching short words
+                    self._words.setdefault(word, idx)
+
+        # Normalized names never contain a newline, so the first find() hit in
+        # the joined roster belongs to the first member containing the PDF name
+        self._joined = '\n'.join(normalized)
+        self._starts = []
+        offset = 0
+        for name in normalized:
+            self._starts.append(offset)
+            offset += len(name) + 1
+
+        self._build_automaton(normalized)
+        fuzzy_min_score = check_min_score(fuzzy_min_score, 'fuzzy_min_score')
+        self._fuzzy = FuzzyIndex(normalized, fuzzy_min_score) if fuzzy_min_score < 1 else None
+        self.fuzzy_hits = {}
+        self.match = functools.lru_cache(maxsize=cache_size)(self._match)
+
+    def _build_automaton(self, normalized):
+        # _goto[state] maps a character to the next state; _first[state] is the
+        # lowest member index among the names ending at state or its fail chain
+        no_match = len(normalized)
+        self._goto = [{}]
+        first = [no_match]
+        for idx, name in enumerate(normalized):
+            state = 0
+            for char in name:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    first.append(no_match)
+                state = next_state
+            first[state] = min(first[state], idx)
+
+        self._fail = [0] * len(self._goto)
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            first[state] = min(first[state], first[self._fail[state]])
+            for char, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                queue.append(next_state)
+        self._first = first
+
+    def _first_contained_member(self, text):
+        """Return the lowest index of a member whose name occurs in text."""
+        goto, fail, first = self._goto, self._fail, self._first
+        best = first[0]
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if first[state] < best:
+                best = first[state]
+        return best
+
+    def _match(self, pdf_name):
+        normalized_pdf_name = normalize_name(pdf_name)
+
+        # First try exact match
+        idx = self._exact.get(normalized_pdf_name)
+        if idx is not None:
+            return self.members[idx]
+
+        # Then the same name spelled without diacritics (e.g. "Rudinger" for "Rüdinger")
+        idx = self._folded.get(fold_name(normalized_pdf_name))
+        if idx is not None:
+            return self.members[idx]
+
+        # Try partial matches (e.g., "Michael Vollenberg Keler" matches "Michael Keler")
+        idx = self._first_contained_member(normalized_pdf_name)
+        position = self._joined.find(normalized_pdf_name)
+        if position >= 0:
+            idx = min(idx, bisect.bisect_right(self._starts, position) - 1)
+        if idx < len(self.members):
+            return self.members[idx]
+
+        # Then a misspelling of a whole member name, before a single shared word decides
+        if self._fuzzy is not None:
+            hit = self._fuzzy.lookup(normalized_pdf_name)
+            if hit is not None:
+                member = self.members[hit[0]]
+                self.fuzzy_hits[pdf_name] = FuzzyHit(member, round(hit[1], 3))
+                return member
+
+        # Try matching by last name (most reliable for Danish names)
+        matches = [self._words[word] for word in normalized_pdf_name.split() if word in self._words]
+        if matches:
+            return self.members[min(matches)]
+
+        return None
+
+@functools.lru_cache(maxsize=8)
+def _matcher_for(members):
+    return MemberMatcher(members)
+
+def find_matching_member(pdf_name, members_list):
+    """Find a matching member name from the members list, handling variations"""
+    return _matcher_for(tuple(members_list)).match(pdf_name)
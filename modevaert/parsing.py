@@ -0,0 +1,166 @@
+"""Line-level parsing of program text: date headers and candidate names."""
+import calendar
+import collections
+import datetime
+import re
+
+from .meeting import DANISH_MONTHS, WEEKDAY, WEEKEND
+
+MONTH_NUMBERS = {name.lower(): number for number, name in enumerate(DANISH_MONTHS, 1)}
+MONTH_ABBREVIATIONS = {name[:3].lower(): number for number, name in enumerate(DANISH_MONTHS, 1)}
+
+def calculate_weekday_in_range(start_day, end_day, month, year, target_weekday):
+    """
+    Calculate the date of a specific weekday within a date range.
+    month: 1=Januar, ..., 12=December
+    target_weekday: 0=Monday, 1=Tuesday, ..., 6=Sunday
+    Days outside the month are ignored.
+    """
+    start_day = max(start_day, 1)
+    end_day = min(end_day, calendar.monthrange(year, month)[1])
+    if start_day > end_day:
+        return None
+    start = datetime.date(year, month, start_day)
+    date_obj = start + datetime.timedelta(days=(target_weekday - start.weekday()) % 7)
+    return date_obj if date_obj.month == month and date_obj.day <= end_day else None
+
+_MONTHS_PATTERN = '|'.join(DANISH_MONTHS)
+_ABBREVIATIONS_PATTERN = '|'.join(name.upper() for name in MONTH_ABBREVIATIONS)
+
+# Every date format a program line can start a meeting with, in order of precedence.
+# Each alternative sits inside one lookahead, so a single finditer pass reports,
+# at every position, the highest-precedence format that matches there.
+_DATE_LINE_RE = re.compile(
+    '(?='
+    # Cross-month range, e.g. "Marts 30-april 05"
+    rf'(?P<cross>(?i:(?P<cross_month1>{_MONTHS_PATTERN})\s+(?P<cross_day1>\d{{1,2}})'
+    rf'-(?P<cross_month2>{_MONTHS_PATTERN})\s+(?P<cross_day2>\d{{1,2}})))'
+    # Single-month range, e.g. "marts 02-08"
+    rf'|(?P<range>(?i:(?P<range_month>{_MONTHS_PATTERN})\s+(?P<range_day1>\d{{1,2}})-(?P<range_day2>\d{{1,2}})))'
+    # Weekday header at the start of the line, e.g. "Tirsdag 15 September"
+    rf'|(?P<weekday>\A(?:Tirsdag|Mandag|Torsdag) (?P<weekday_day>\d{{2}}) (?P<weekday_month>{_MONTHS_PATTERN}))'
+    # Weekend date at the start of the line, e.g. "07/09/2025"
+    r'|(?P<weekend>\A(?P<weekend_day>\d{2})/(?P<weekend_month>\d{2})/(?P<weekend_year>\d{4}))'
+    # January workbook header, e.g. "06. JAN | UGENS BIBELLÆSNING"
+    r'|(?P<january>(?P<january_day>\d{2})\.\s*JAN)'
+    # Full month name, e.g. "01 Januar 26", "01. Januar 26"
+    rf'|(?P<danish>(?P<danish_day>\d{{2}})\.?\s*(?P<danish_month>{_MONTHS_PATTERN}))'
+    # Abbreviated month, e.g. "03. FEB", "10 feb"
+    rf'|(?P<abbrev>(?i:(?P<abbrev_day>\d{{2}})\.?\s*(?P<abbrev_month>{_ABBREVIATIONS_PATTERN})))'
+    ')'
+)
+_DATE_KIND_RANK = {
+    kind: rank for rank, kind in enumerate(
+        ('cross', 'range', 'weekday', 'weekend', 'january', 'danish', 'abbrev')
+    )
+}
+_DIGITS = frozenset('0123456789')
+
+# A recognized date header: the meeting of `kind` opened on `date`, the
+# weekend meeting of a date range, and whether the line cancels the meeting(s)
+DateHeader = collections.namedtuple('DateHeader', 'kind date weekend_date no_meeting')
+
+def _safe_date(year, month, day):
+    try:
+        return datetime.date(year, month, day)
+    except ValueError:
+        return None
+
+def tokenize_date_line(line):
+    """Classify a stripped program line, returning a DateHeader or None."""
+    # Every supported format contains a digit, so most lines never reach the regex
+    if _DIGITS.isdisjoint(line):
+        return None
+
+    best = None
+    best_rank = len(_DATE_KIND_RANK)
+    for match in _DATE_LINE_RE.finditer(line):
+        rank = _DATE_KIND_RANK[match.lastgroup]
+        if rank < best_rank:
+            best, best_rank = match, rank
+            if rank == 0:
+                break
+    if best is None:
+        return None
+
+    kind = best.lastgroup
+    group = best.group
+    if kind == 'cross':
+        start_month = MONTH_NUMBERS[group('cross_month1').lower()]
+        end_month = MONTH_NUMBERS[group('cross_month2').lower()]
+        start_day = int(group('cross_day1'))
+        end_day = int(group('cross_day2'))
+        # The range starts in one month and runs into the next (1 = Tuesday, 6 = Sunday)
+        tuesday_date = (calculate_weekday_in_range(start_day, 31, start_month, 2026, 1)
+                        or calculate_weekday_in_range(1, end_day, end_month, 2026, 1))
+        sunday_date = (calculate_weekday_in_range(start_day, 31, start_month, 2026, 6)
+                       or calculate_weekday_in_range(1, end_day, end_month, 2026, 6))
+        no_meeting = 'Intet møde' in line or 'Ingen møde' in line
+        return DateHeader(WEEKDAY, tuesday_date, sunday_date, no_meeting)
+    if kind == 'range':
+        month = MONTH_NUMBERS[group('range_month').lower()]
+        start_day = int(group('range_day1'))
+        end_day = int(group('range_day2'))
+        tuesday_date = calculate_weekday_in_range(start_day, end_day, month, 2026, 1)
+        sunday_date = calculate_weekday_in_range(start_day, end_day, month, 2026, 6)
+        no_meeting = 'Intet møde' in line or 'Ingen møde' in line
+        return DateHeader(WEEKDAY, tuesday_date, sunday_date, no_meeting)
+    if kind == 'weekend':
+        date = _safe_date(int(group('weekend_year')), int(group('weekend_month')), int(group('weekend_day')))
+        return DateHeader(WEEKEND, date, None, False)
+
+    if kind == 'weekday':
+        month = MONTH_NUMBERS[group('weekday_month').lower()]
+        day = group('weekday_day')
+        year = 2025
+    elif kind == 'january':
+        month = 1
+        day = group('january_day')
+        year = 2026
+    elif kind == 'danish':
+        month = MONTH_NUMBERS[group('danish_month').lower()]
+        day = group('danish_day')
+        # Assume 2026 for January dates, 2025 for others
+        year = 2026 if month == 1 else 2025
+    else:
+        month = MONTH_ABBREVIATIONS[group('abbrev_month').lower()]
+        day = group('abbrev_day')
+        year = 2026 if month <= 3 else 2025
+    return DateHeader(WEEKDAY, _safe_date(year, month, int(day)), None, 'Ingen møde' in line)
+
+# A capitalized Danish first name followed by one or more capitalized names
+_NAME_PATTERN = r'[A-ZÆØÅ][a-zæøåõ]+(?:\s+[A-ZÆØÅ][a-zæøåõ]+)+'
+
+# One pass over a line finds every name together with the punctuation around it:
+# a leading ':', '(' or '/', a closing ')' and a following '/'. The leading
+# lookahead lets the regex engine skip ahead to positions that can start a match.
+_NAME_RE = re.compile(
+    rf'(?=[:(/A-ZÆØÅ])([:(/]?)\s*({_NAME_PATTERN})(\)?)(?:(?=\s*(/)))?'
+)
+
+def _name_context(lead, close, slash):
+    if lead == ':':
+        return 'colon'
+    if lead == '(' and close:
+        return 'paren'
+    if lead == '/' or slash:
+        return 'slash'
+    return None
+
+# findall() yields empty strings for absent punctuation, so every combination is known up front
+_NAME_CONTEXTS = {
+    (lead, close, slash): _name_context(lead, close, slash)
+    for lead in ('', ':', '(', '/') for close in ('', ')') for slash in ('', '/')
+}
+
+def extract_candidate_names(line):
+    """Return (name, context) for every candidate name in a program line.
+
+    context is 'colon' for "Bøn: Marcel Ale", 'paren' for "(Marcel Ale)",
+    'slash' for either side of "Christopher Rüdinger/Lucas Vinzentsen" and
+    None otherwise.
+    """
+    return [
+        (name, _NAME_CONTEXTS[lead, close, slash])
+        for lead, name, close, slash in _NAME_RE.findall(line)
+    ]
@@ -0,0 +1,26 @@
+"""A process pool shared by the CPU-bound parts of the pipeline."""
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+
+# Number of worker processes used for extraction and schedule search; 1 disables the pool
+DEFAULT_WORKERS = int(os.environ.get('MODEVAERT_WORKERS', os.cpu_count() or 1))
+
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+def get_process_pool(workers):
+    """Return a process pool with the given size, reused across Streamlit reruns."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            # spawn avoids forking the multi-threaded Streamlit server process
+            _executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+            )
+            _executor_workers = workers
+        return _executor
@@ -0,0 +1,44 @@
+"""Page prefilter: find the pages of a program that can contribute meetings.
+
+Cover pages, song lists and instructions carry no date headers, and the
+names on them are ignored by the parser unless a meeting is open. The
+prefilter walks the pages with the same date tokenizer and name scanner as
+parse_program_lines, but only to decide which pages matter, so the parser
+and the (slow) layout extraction can skip the rest.
+"""
+import os
+
+from .parsing import extract_candidate_names, tokenize_date_line
+
+# Set MODEVAERT_PAGE_PREFILTER=0 to extract and scan every page
+PREFILTER = os.environ.get('MODEVAERT_PAGE_PREFILTER', '1') != '0'
+
+# Lines that switch the parser into the weekend section of the current meeting
+SECTION_MARKERS = ('Weekendmødet', 'Weekendopgaver')
+
+def relevant_pages(page_texts):
+    """Return the indices of the pages that can change what parse_program_lines finds.
+
+    A page is kept when it has a date header (which opens or closes a meeting)
+    or when a meeting is open at its start and it has names or a section
+    marker. Every other page is ignored by the parser anyway, so skipping it
+    does not change the parsed meetings.
+    """
+    keep = []
+    meeting_open = False
+    for idx, text in enumerate(page_texts):
+        relevant = False
+        open_at_start = meeting_open
+        for line in text.split('\n'):
+            line = line.strip()
+            header = tokenize_date_line(line)
+            if header:
+                relevant = True
+                meeting_open = bool(header.date or header.weekend_date) and not header.no_meeting
+            elif not relevant and open_at_start and (
+                    any(marker in line for marker in SECTION_MARKERS)
+                    or extract_candidate_names(line)):
+                relevant = True
+        if relevant:
+            keep.append(idx)
+    return keep
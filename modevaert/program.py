@@ -0,0 +1,211 @@
+"""Parsing of meeting programs into meeting dates and assigned members."""
+import collections
+import time
+
+from .backends import AUTO, DEFAULT_BACKEND, FALLBACK_BACKEND, resolve_backend
+from .extraction import iter_all_page_texts, read_file_bytes
+from .meeting import WEEKEND, Meeting
+from .members import MemberMatcher
+from .parsing import extract_candidate_names, tokenize_date_line
+
+def parse_program_lines(lines, matcher, stats=None, hits=None):
+    """Run the date/name state machine over the lines of one program.
+
+    matcher: a MemberMatcher for the roster the names are matched against.
+    stats: optional Counter that receives 'date_headers', 'names' (candidate
+    names scanned), 'matched', 'fuzzy_matched' (of those, names matched as a
+    misspelling of a member) and 'match_s' (seconds spent matching names).
+    hits: optional dict that receives pdf_name -> FuzzyHit of the names in
+    these lines matched as a misspelling (matcher.fuzzy_hits holds all of them).
+    Returns a dict (date, kind) -> set of assigned members.
+    """
+    match = matcher.match if stats is None else _timed(matcher.match, stats, 'match_s')
+    fuzzy_hits = matcher.fuzzy_hits
+    header_count = name_count = matched_count = fuzzy_count = 0
+    meetings = {}
+    current_date = None
+    current_weekend_date = None
+    assigned = set()
+    weekend_assigned = set()
+    in_weekend_section = False  # Track if we're in a weekend meeting section
+    for line in lines:
+        line = line.strip()
+        
+        header = tokenize_date_line(line)
+        if header:
+            header_count += 1
+            if current_date:
+                meetings[current_date] = assigned
+            if current_weekend_date:
+                meetings[current_weekend_date] = weekend_assigned
+            # Reset weekend section flag when we encounter a new date
+            in_weekend_section = False
+            
+            current_date = (header.date, header.kind) if header.date else None
+            current_weekend_date = (header.weekend_date, WEEKEND) if header.weekend_date else None
+            assigned = set()
+            weekend_assigned = set()
+            
+            if header.no_meeting:
+                current_date = None
+                current_weekend_date = None
+                continue
+        
+        # Check if we're entering a weekend meeting section
+        if 'Weekendmødet' in line or 'Weekendopgaver' in line:
+            in_weekend_section = True
+        
+        # Extract names for both weekly (Tuesday) and weekend (Sunday) meetings
+        if current_date or current_weekend_date:
+            # Match every name on the line to the members list and add to assigned set
+            for pdf_name, _context in extract_candidate_names(line):
+                name_count += 1
+                matched_member = match(pdf_name)
+                if matched_member:
+                    matched_count += 1
+                    if pdf_name in fuzzy_hits:
+                        fuzzy_count += 1
+                        if hits is not None:
+                            hits[pdf_name] = fuzzy_hits[pdf_name]
+                    # If we're in a weekend section and have a weekend date, assign to weekend
+                    if in_weekend_section and current_weekend_date:
+                        weekend_assigned.add(matched_member)
+                    # Otherwise, assign to weekly meeting (Tuesday)
+                    elif current_date:
+                        assigned.add(matched_member)
+    
+    # Save any remaining dates
+    if current_date:
+        meetings[current_date] = assigned
+    if current_weekend_date:
+        meetings[current_weekend_date] = weekend_assigned
+    
+    if stats is not None:
+        stats.update(
+            date_headers=header_count, names=name_count, matched=matched_count, fuzzy_matched=fuzzy_count
+        )
+    return meetings
+
+def _timed(func, stats, key):
+    """Wrap func so that the seconds spent in it accumulate in stats[key]."""
+    def timed(*args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            stats[key] += time.perf_counter() - start
+    return timed
+
+def _timed_pages(page_texts, stats):
+    """Pass the page texts through, adding the time spent producing them to stats['extract_s']."""
+    page_texts = iter(page_texts)
+    while True:
+        start = time.perf_counter()
+        text = next(page_texts, None)
+        stats['extract_s'] += time.perf_counter() - start
+        if text is None:
+            return
+        yield text
+
+def iter_program_lines(page_texts, stats=None):
+    """Yield the lines of a program page by page, skipping empty pages.
+
+    stats: optional Counter; 'pages' counts the pages read and 'pages_skipped'
+    the empty ones, which includes pages the prefilter kept out of extraction.
+    'lines' counts the lines and 'extract_s' the seconds spent waiting for
+    page text.
+    """
+    if stats is not None:
+        page_texts = _timed_pages(page_texts, stats)
+    for page_text in page_texts:
+        if stats is not None:
+            stats['pages'] += 1
+        if page_text:
+            lines = page_text.split('\n')
+            if stats is not None:
+                stats['lines'] += len(lines)
+            yield from lines
+        elif stats is not None:
+            stats['pages_skipped'] += 1
+
+def _reporting_pages(page_texts, on_page, index):
+    for page_text in page_texts:
+        yield page_text
+        on_page(index)
+
+def parse_program_files(pdf_blobs, matcher, cache=None, workers=None, backend=None, stats=None,
+                        file_stats=None, on_page=None, file_hits=None):
+    """Yield, for each PDF in input order, its dict (date, kind) -> set of assigned members.
+
+    backend: the text extraction backend (see backends). With 'auto' a PDF in
+    which the fast backend finds no meeting dates is extracted again with pdfplumber.
+    stats: optional Counter summed over all PDFs (see iter_program_lines,
+    parse_program_lines and iter_all_page_texts), plus 'match_cache_hits' and
+    'match_cache_misses' of the matcher's memo.
+    file_stats: optional list that receives one such Counter per PDF, in order.
+    file_hits: optional list that receives, per PDF in order, the dict pdf_name -> FuzzyHit
+    of its names matched as a misspelling (see parse_program_lines).
+    on_page: optional callable, called with the index of the PDF after each of its pages is parsed.
+    """
+    backend = backend or DEFAULT_BACKEND
+    first = resolve_backend(backend)
+    page_text_iters = iter_all_page_texts(
+        pdf_blobs, cache=cache, workers=workers, backend=first, stats=stats
+    )
+    for index, (pdf_bytes, page_texts) in enumerate(zip(pdf_blobs, page_text_iters)):
+        if on_page is not None:
+            page_texts = _reporting_pages(page_texts, on_page, index)
+        attempt = collections.Counter()
+        hits = {}
+        cache_before = matcher.match.cache_info()
+        meetings = parse_program_lines(iter_program_lines(page_texts, attempt), matcher, attempt, hits)
+        if not meetings and backend == AUTO and first != FALLBACK_BACKEND:
+            # Count the pages of the pass whose result is used
+            attempt.clear()
+            hits = {}
+            [page_texts] = iter_all_page_texts(
+                [pdf_bytes], cache=cache, workers=workers, backend=FALLBACK_BACKEND, stats=stats
+            )
+            if on_page is not None:
+                page_texts = _reporting_pages(page_texts, on_page, index)
+            meetings = parse_program_lines(iter_program_lines(page_texts, attempt), matcher, attempt, hits)
+        cache_after = matcher.match.cache_info()
+        attempt['match_cache_hits'] = cache_after.hits - cache_before.hits
+        attempt['match_cache_misses'] = cache_after.misses - cache_before.misses
+        if stats is not None:
+            stats.update(attempt)
+        if file_stats is not None:
+            file_stats.append(attempt)
+        if file_hits is not None:
+            file_hits.append(hits)
+        yield meetings
+
+def merge_program_meetings(per_file_meetings):
+    """Merge the meetings of several programs into a date-sorted list of Meeting records."""
+    all_meetings = {}
+    for meetings in per_file_meetings:
+        # Merge meetings from this PDF into all_meetings
+        for key, assigned_people in meetings.items():
+            if key in all_meetings:
+                # If date already exists, merge the assigned people
+                all_meetings[key].update(assigned_people)
+            else:
+                all_meetings[key] = set(assigned_people)
+    
+    return [
+        Meeting(date, kind, assigned_people)
+        for (date, kind), assigned_people in sorted(all_meetings.items())
+    ]
+
+def parse_program(uploaded_files, members_list, cache=None, workers=None, backend=None,
+                  stats=None, file_stats=None):
+    """Parse the uploaded programs into a date-sorted list of Meeting records.
+
+    stats, file_stats: optional counters of pages, lines, date headers, names,
+    matches, match cache hits and time spent, see parse_program_files.
+    """
+    matcher = MemberMatcher(members_list)
+    pdf_blobs = [read_file_bytes(uploaded_file) for uploaded_file in uploaded_files]
+    return merge_program_meetings(
+        parse_program_files(pdf_blobs, matcher, cache, workers, backend, stats, file_stats)
+    )
@@ -0,0 +1,86 @@
+"""Program parsing on a background thread, with progress for the UI.
+
+A ProgramParse runs parse_program_files off the caller's thread and
+exposes how far it got: PDFs and pages done out of the total, and the
+meetings of the PDFs finished so far. The Streamlit page polls it while it
+runs, so progress and partial results show up as they happen, and a rerun
+in the middle (a widget was touched) picks the same parse up again instead
+of starting over.
+"""
+import collections
+import threading
+
+from .backends import PdfiumBackend, get_backend
+from .extraction import read_file_bytes
+from .members import MemberMatcher
+from .program import merge_program_meetings, parse_program_files
+
+class ProgramParse:
+    """parse_program for the given files, running on a daemon thread from start() on.
+
+    stats, files: the counters of parse_program's stats and file_stats.
+    fuzzy_hits: the program names matched as misspellings, see MemberMatcher.
+    """
+
+    def __init__(self, uploaded_files, members_list, cache=None, workers=None, backend=None):
+        self.pdf_blobs = [read_file_bytes(uploaded_file) for uploaded_file in uploaded_files]
+        self.matcher = MemberMatcher(members_list)
+        self.fuzzy_hits = self.matcher.fuzzy_hits
+        self.cache = cache
+        self.workers = workers
+        self.backend = backend
+        self.stats = collections.Counter()
+        self.files = []
+        self.page_counts = None
+        self.pages_done = [0] * len(self.pdf_blobs)
+        self.per_file = []
+        self.error = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='modevaert-parse', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _page_done(self, index):
+        self.pages_done[index] += 1
+
+    def _run(self):
+        try:
+            # PDFium opens a PDF in milliseconds, so the totals are known almost at once
+            counter = get_backend(PdfiumBackend.name)
+            self.page_counts = [counter.count_pages(pdf_bytes) for pdf_bytes in self.pdf_blobs]
+            for meetings in parse_program_files(
+                    self.pdf_blobs, self.matcher, self.cache, self.workers, self.backend,
+                    self.stats, self.files, on_page=self._page_done):
+                self.per_file.append(meetings)
+        except Exception as exc:
+            self.error = exc
+        finally:
+            self._done.set()
+
+    def wait(self, timeout=None):
+        """Wait up to timeout seconds; returns whether the parse has finished."""
+        return self._done.wait(timeout)
+
+    @property
+    def files_done(self):
+        return len(self.per_file)
+
+    @property
+    def fraction(self):
+        """Share of all pages parsed so far, between 0 and 1."""
+        if not self.page_counts:
+            return 0.0
+        # A PDF re-read by the 'auto' fallback counts its pages twice; never report more than all
+        done = sum(min(done, total) for done, total in zip(self.pages_done, self.page_counts))
+        return done / max(sum(self.page_counts), 1)
+
+    def meetings(self):
+        """Meetings of the PDFs finished so far; after wait() returned True, all of them.
+
+        Raises the parse's exception if it failed.
+        """
+        if self.error is not None:
+            raise self.error
+        return merge_program_meetings(list(self.per_file))
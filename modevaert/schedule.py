@@ -0,0 +1,232 @@
+"""Assignment of meeting hosts.
+
+generate_schedule runs a pluggable strategy under a shared set of
+constraints. The 'fair' strategy picks the available members who have
+hosted least often and least recently; 'round_robin' is the original
+rotation through the roster.
+"""
+import collections
+import dataclasses
+import datetime
+import heapq
+import os
+
+from .matrix import AvailabilityMatrix
+from .meeting import WEEKEND
+
+NO_HOST = 'No available'
+
+# Most hostings a member's history may put them behind the busiest member when a period starts
+HISTORY_MAX_LAG = int(os.environ.get('MODEVAERT_HISTORY_MAX_LAG', '2'))
+
+@dataclasses.dataclass(frozen=True)
+class SchedulingConstraints:
+    """Rules every strategy must respect when picking hosts.
+
+    min_spacing_days: minimum number of days between two hostings by the same member.
+    max_per_month: default cap on hostings per member per calendar month (None = no cap).
+    monthly_caps: per-member caps overriding max_per_month.
+    respect_conflicts: skip members already assigned to the meeting in the program.
+    """
+
+    min_spacing_days: int = 0
+    max_per_month: int = None
+    monthly_caps: dict = dataclasses.field(default_factory=dict)
+    respect_conflicts: bool = True
+
+class HostingState:
+    """Who has hosted how often and when, and which hostings the constraints allow.
+
+    The static rules (Sunday-only members, program conflicts) are looked up in
+    an AvailabilityMatrix instead of being re-evaluated per candidate.
+    history: optional HostingHistory of earlier periods (see ledger) that
+    seeds the counts and last hosted dates. The seeded counts are relative:
+    nobody starts more than HISTORY_MAX_LAG hostings behind the busiest member,
+    so someone who joined or came back during the window does not host every
+    meeting until they have caught up.
+    """
+
+    def __init__(self, members, availability, constraints, matrix, history=None):
+        self.availability = availability
+        self.constraints = constraints
+        self.matrix = matrix
+        self.history = history
+        self.count = dict.fromkeys(members, 0)
+        self.last_hosted = dict.fromkeys(members)
+        if history is not None:
+            counts = {member: history.counts.get(member, 0) for member in self.count}
+            floor = max(counts.values(), default=0) - HISTORY_MAX_LAG
+            lowest = min((max(count, floor) for count in counts.values()), default=0)
+            for member in self.count:
+                self.count[member] = max(counts[member], floor) - lowest
+                self.last_hosted[member] = history.last_hosted.get(member)
+        self.month_count = collections.Counter()  # (member, year, month) -> hostings
+        self._available = matrix.available(constraints.respect_conflicts)
+
+    def can_host(self, member, meeting):
+        # Sunday-only members on weekday meetings and members already involved in the meeting
+        if not self._available.item(self.matrix.row[member], self.matrix.column[meeting]):
+            return False
+        last_hosted = self.last_hosted.get(member)
+        if (last_hosted is not None and self.constraints.min_spacing_days
+                and (meeting.date - last_hosted).days < self.constraints.min_spacing_days):
+            return False
+        cap = self.constraints.monthly_caps.get(member, self.constraints.max_per_month)
+        if cap is not None:
+            if self.month_count[member, meeting.date.year, meeting.date.month] >= cap:
+                return False
+        return True
+
+    def record(self, member, meeting):
+        self.count[member] = self.count.get(member, 0) + 1
+        self.last_hosted[member] = meeting.date
+        self.month_count[member, meeting.date.year, meeting.date.month] += 1
+
+class RoundRobinStrategy:
+    """The original rotation: one pointer walks the roster, skipping unavailable members.
+
+    The two hosts of a meeting are different members.
+    """
+
+    name = 'round_robin'
+
+    def assign(self, members, meetings, state):
+        schedule = {}
+        i = 0
+        n = len(members)
+        if state.history is not None:
+            # Continue the rotation after whoever hosted last in an earlier period
+            hosted = [
+                (state.history.last_hosted[member], idx) for idx, member in enumerate(members)
+                if member in state.history.last_hosted
+            ]
+            if hosted:
+                i = max(hosted)[1] + 1
+
+        for meeting in meetings:
+            hosts = []
+            for _ in range(2):
+                host = None
+                attempts = 0
+                max_attempts = n * 2
+                while host is None and attempts < max_attempts:
+                    cand = members[i % n]
+                    i += 1
+                    attempts += 1
+                    if cand not in hosts and state.can_host(cand, meeting):
+                        host = cand
+                hosts.append(host)
+
+            if hosts[0] and hosts[1]:
+                # Only a meeting that got both hosts counts towards their load, spacing and caps
+                for host in hosts:
+                    state.record(host, meeting)
+                schedule[meeting] = tuple(hosts)
+            else:
+                schedule[meeting] = (NO_HOST, NO_HOST)
+        return schedule
+
+class FairStrategy:
+    """Give each meeting to the two available members who hosted least often, then least recently.
+
+    Members sit in heaps ordered by (hostings, last hosted date, roster position),
+    one heap for members who can host any meeting and one for Sunday-only members,
+    which is only consulted for weekend meetings. Hosting pushes a fresh entry and
+    leaves the old one behind; outdated entries are discarded when they surface.
+    """
+
+    name = 'fair'
+
+    def assign(self, members, meetings, state):
+        position = {}
+        for idx, member in enumerate(members):
+            position.setdefault(member, idx)
+        never = datetime.date.min
+
+        def entry_for(member):
+            return (state.count[member], state.last_hosted[member] or never, position[member], member)
+
+        def pool_for(member):
+            return state.availability.get(member) == 'sunday_only'
+
+        pools = {False: [], True: []}
+        for member in position:
+            pools[pool_for(member)].append(entry_for(member))
+        for heap in pools.values():
+            heapq.heapify(heap)
+
+        def pop_best(heaps):
+            # Return the smallest current entry across heaps, dropping outdated ones
+            for heap in heaps:
+                while heap and heap[0] != entry_for(heap[0][-1]):
+                    heapq.heappop(heap)
+            heaps_with_entries = [heap for heap in heaps if heap]
+            if not heaps_with_entries:
+                return None
+            return heapq.heappop(min(heaps_with_entries, key=lambda heap: heap[0]))
+
+        schedule = {}
+        for meeting in meetings:
+            heaps = [pools[False], pools[True]] if meeting.kind == WEEKEND else [pools[False]]
+            picked = []
+            skipped = []
+            while len(picked) < 2:
+                entry = pop_best(heaps)
+                if entry is None:
+                    break
+                if state.can_host(entry[-1], meeting):
+                    picked.append(entry)
+                else:
+                    skipped.append(entry)
+
+            if len(picked) < 2:
+                skipped.extend(picked)
+                schedule[meeting] = (NO_HOST, NO_HOST)
+            else:
+                hosts = tuple(entry[-1] for entry in picked)
+                for member in hosts:
+                    state.record(member, meeting)
+                    heapq.heappush(pools[pool_for(member)], entry_for(member))
+                schedule[meeting] = hosts
+            for entry in skipped:
+                heapq.heappush(pools[pool_for(entry[-1])], entry)
+        return schedule
+
+STRATEGIES = {strategy.name: strategy for strategy in (FairStrategy, RoundRobinStrategy)}
+
+def generate_schedule(members, meetings, availability=None, strategy='fair', constraints=None,
+                      matrix=None, pinned=None, history=None):
+    """Generate schedule of hosts per meeting.
+
+    meetings: Meeting records, e.g. from parse_program.
+    availability: optional dict name -> flag, e.g. 'sunday_only'.
+    strategy: a name from STRATEGIES or a strategy instance.
+    constraints: optional SchedulingConstraints.
+    matrix: optional AvailabilityMatrix already built for these members and the meetings to assign.
+    pinned: optional dict Meeting -> (host 1, host 2) of hosts already announced. Those
+    meetings keep their hosts and count towards the load, spacing and caps of the others.
+    history: optional HostingHistory of earlier periods, e.g. from HostingLedger.history;
+    the rotation and the fairness order carry on from it.
+    Returns a dict Meeting -> (host 1, host 2) in date order.
+    """
+    if availability is None:
+        availability = {}
+    if constraints is None:
+        constraints = SchedulingConstraints()
+    if isinstance(strategy, str):
+        strategy = STRATEGIES[strategy]()
+    if pinned:
+        meetings = [meeting for meeting in meetings if meeting not in pinned]
+    if matrix is None:
+        matrix = AvailabilityMatrix(members, meetings, availability)
+    state = HostingState(members, availability, constraints, matrix, history)
+    if not pinned:
+        return strategy.assign(members, matrix.meetings, state)
+
+    for meeting, hosts in sorted(pinned.items()):
+        for member in hosts:
+            if member != NO_HOST:
+                state.record(member, meeting)
+    schedule = dict(pinned)
+    schedule.update(strategy.assign(members, matrix.meetings, state))
+    return dict(sorted(schedule.items()))
@@ -0,0 +1,143 @@
+"""Search over several candidate schedules, keeping the one with the best quality score.
+
+A single generate_schedule run depends on the roster order. search_schedules
+runs K candidates with different strategies, roster rotations and shuffles,
+scores each with score_schedule and returns the best one found within the
+time budget.
+"""
+import concurrent.futures
+import random
+import time
+
+from .matrix import AvailabilityMatrix
+from .pool import DEFAULT_WORKERS, get_process_pool
+from .schedule import NO_HOST, SchedulingConstraints, generate_schedule
+
+# Weights of the score components; a lower total is better
+UNASSIGNED_WEIGHT = 100.0
+SPACING_WEIGHT = 1.0
+BALANCE_WEIGHT = 0.5
+
+# Spacing that counts as "too soon" when no minimum spacing is configured
+DEFAULT_SPACING_DAYS = 7
+
+def score_schedule(matrix, schedule, constraints=None):
+    """Score a schedule with array operations over the AvailabilityMatrix.
+
+    load_variance: variance of hostings per member.
+    spacing_violations: consecutive hostings by one member closer than the minimum spacing.
+    balance: variance of weekend hostings plus variance of weekday hostings.
+    unassigned: meetings left without two hosts.
+    """
+    import numpy as np
+
+    constraints = constraints or SchedulingConstraints()
+    hosts = matrix.hosts(schedule)
+    load = hosts.sum(axis=1)
+
+    # np.nonzero walks row by row, so equal neighbouring rows are consecutive hostings
+    rows, cols = np.nonzero(hosts)
+    ordinals = np.array([meeting.date.toordinal() for meeting in matrix.meetings], dtype=np.int64)
+    spacing = constraints.min_spacing_days or DEFAULT_SPACING_DAYS
+    same_member = rows[1:] == rows[:-1]
+    gaps = ordinals[cols[1:]] - ordinals[cols[:-1]]
+    spacing_violations = int((same_member & (gaps < spacing)).sum())
+
+    weekend_load = hosts[:, matrix.weekend].sum(axis=1)
+    weekday_load = load - weekend_load
+    balance = float(weekend_load.var() + weekday_load.var()) if len(load) else 0.0
+    load_variance = float(load.var()) if len(load) else 0.0
+    unassigned = sum(1 for assigned in schedule.values() if NO_HOST in assigned)
+
+    total = (
+        load_variance
+        + SPACING_WEIGHT * spacing_violations
+        + BALANCE_WEIGHT * balance
+        + UNASSIGNED_WEIGHT * unassigned
+    )
+    return {
+        'total': total,
+        'load_variance': load_variance,
+        'spacing_violations': spacing_violations,
+        'balance': balance,
+        'unassigned': unassigned,
+    }
+
+def candidate_plans(members, count, seed=0):
+    """Return (strategy, roster order) for each of `count` candidates.
+
+    The first two candidates are the plain 'fair' and 'round_robin' schedules;
+    the rest alternate strategies over rotated and shuffled rosters.
+    """
+    plans = [('fair', list(members)), ('round_robin', list(members))]
+    rng = random.Random(seed)
+    n = max(len(members), 1)
+    for k in range(2, count):
+        strategy = 'fair' if k % 2 == 0 else 'round_robin'
+        if k % 4 < 2:
+            shift = (k * n) // count
+            order = list(members[shift:]) + list(members[:shift])
+        else:
+            order = list(members)
+            rng.shuffle(order)
+        plans.append((strategy, order))
+    return plans[:count]
+
+def _run_candidate(members, order, meetings, availability, constraints, strategy, pinned, history):
+    """Generate and score one candidate; runs inside pool workers."""
+    matrix = AvailabilityMatrix(members, meetings, availability)
+    schedule = generate_schedule(
+        order, meetings, availability, strategy, constraints, pinned=pinned, history=history
+    )
+    return schedule, score_schedule(matrix, schedule, constraints)
+
+def search_schedules(members, meetings, availability=None, constraints=None, candidates=16,
+                     workers=None, time_budget=None, seed=0, pinned=None, history=None):
+    """Generate up to `candidates` schedules and return (best schedule, its score).
+
+    Candidates run in a process pool of `workers` processes (1 runs them in
+    this process). Once `time_budget` seconds have passed, unfinished
+    candidates are cancelled and the best finished one wins; at least one
+    candidate is always completed. Ties go to the earlier candidate.
+    pinned: hosts every candidate keeps, as for generate_schedule.
+    history: HostingHistory of earlier periods every candidate starts from, as for generate_schedule.
+    """
+    if workers is None:
+        workers = DEFAULT_WORKERS
+    meetings = list(meetings)
+    availability = availability or {}
+    plans = candidate_plans(list(members), max(candidates, 1), seed)
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    results = {}
+
+    if workers <= 1:
+        for idx, (strategy, order) in enumerate(plans):
+            if results and deadline is not None and time.monotonic() >= deadline:
+                break
+            results[idx] = _run_candidate(
+                members, order, meetings, availability, constraints, strategy, pinned, history
+            )
+    else:
+        executor = get_process_pool(workers)
+        futures = {
+            executor.submit(
+                _run_candidate, members, order, meetings, availability, constraints, strategy, pinned,
+                history
+            ): idx
+            for idx, (strategy, order) in enumerate(plans)
+        }
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        done, pending = concurrent.futures.wait(futures, timeout=timeout)
+        if not done:
+            done, pending = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+        for future in pending:
+            future.cancel()
+        for future in done:
+            results[futures[future]] = future.result()
+
+    best = min(results, key=lambda idx: (results[idx][1]['total'], idx))
+    schedule, score = results[best]
+    score = dict(score, candidate=best, strategy=plans[best][0], evaluated=len(results))
+    return schedule, score
@@ -0,0 +1,290 @@
+"""A small HTTP job service for generating schedules from other tools.
+
+    python -m modevaert.service [--host 127.0.0.1] [--port 8765] [--workers N]
+
+POST /jobs takes a multipart/form-data upload with one 'roster' file (.xlsx
+or .csv), one or more 'program' PDF files and optionally the fields
+'strategy', 'min_spacing', 'max_per_month' and 'format' (xlsx, csv or
+parquet). It answers 202 with the job, or 200 if an identical submission
+already finished. GET /jobs/<id> returns the job's status (queued, running,
+done or failed) and GET /jobs/<id>/result the schedule file once it is done.
+
+Jobs run parse_members, parse_program, generate_schedule and the export on
+a bounded pool of worker threads; PDF extraction itself still uses the shared
+process pool and the page text cache. The job id is a hash of the input
+files and settings, so resubmitting the same files returns the existing job
+and its result without running the pipeline again. The most recent jobs and
+their results are kept in memory.
+"""
+import argparse
+import collections
+import concurrent.futures
+import email.parser
+import email.policy
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .export import EXPORTERS
+from .extraction import PageTextCache
+from .instrumentation import Instrumentation
+from .members import parse_members
+from .program import parse_program
+from .schedule import STRATEGIES, SchedulingConstraints, generate_schedule
+
+# Number of jobs that run at the same time
+SERVICE_WORKERS = int(os.environ.get('MODEVAERT_SERVICE_WORKERS', '2'))
+# Jobs waiting or running before new submissions are turned away with 503
+MAX_PENDING = int(os.environ.get('MODEVAERT_SERVICE_MAX_PENDING', '32'))
+# Finished jobs (and their results) kept for status, result and repeated submissions
+MAX_JOBS = int(os.environ.get('MODEVAERT_SERVICE_MAX_JOBS', '128'))
+MAX_UPLOAD_BYTES = int(os.environ.get('MODEVAERT_SERVICE_MAX_MB', '64')) * 1024 * 1024
+
+CONTENT_TYPES = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+class JobError(ValueError):
+    """A submission the service cannot accept; the message is returned to the client."""
+
+class Job:
+    """One submission: its inputs until it runs, then its status and result."""
+
+    def __init__(self, job_id, roster, programs, settings):
+        self.id = job_id
+        self.roster = roster
+        self.programs = programs
+        self.settings = settings
+        self.status = 'queued'
+        self.error = None
+        self.result = None
+        self.meetings = None
+        self.report = None
+
+    def describe(self):
+        info = {'id': self.id, 'status': self.status, 'format': self.settings['format']}
+        if self.status == 'done':
+            info.update(meetings=self.meetings, result=f'/jobs/{self.id}/result', report=self.report)
+        elif self.status == 'failed':
+            info['error'] = self.error
+        return info
+
+def job_key(roster, programs, settings):
+    """Hash of the input files and settings; identical submissions share one job."""
+    digest = hashlib.sha256()
+    for blob in (roster, *programs):
+        digest.update(hashlib.sha256(blob).digest())
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    return digest.hexdigest()[:32]
+
+def run_pipeline(roster, programs, settings, cache=None):
+    """Generate the schedule file of one job; returns (file bytes, meeting count, report)."""
+    run = Instrumentation('service')
+    with run.stage('parse_members'):
+        members, availability = parse_members(io.BytesIO(roster))
+    with run.stage('parse_program'):
+        meetings = parse_program(
+            [io.BytesIO(pdf) for pdf in programs], members, cache=cache,
+            stats=run.counters, file_stats=run.files
+        )
+    if not meetings:
+        raise JobError('no meetings found in the program PDFs')
+    constraints = SchedulingConstraints(
+        min_spacing_days=settings['min_spacing'], max_per_month=settings['max_per_month']
+    )
+    with run.stage('generate_schedule'):
+        schedule = generate_schedule(members, meetings, availability, settings['strategy'], constraints)
+    with run.stage(f"create_{settings['format']}"):
+        output = EXPORTERS[settings['format']](schedule)
+    return output.getvalue(), len(meetings), run.finish()
+
+class JobService:
+    """The job table, result cache and worker pool behind the HTTP handler."""
+
+    def __init__(self, workers=SERVICE_WORKERS, max_pending=MAX_PENDING, max_jobs=MAX_JOBS, cache=None):
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix='modevaert-job'
+        )
+        self.max_pending = max_pending
+        self.max_jobs = max_jobs
+        self.cache = cache
+        self.jobs = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def submit(self, roster, programs, settings):
+        """Queue a job, or return the existing one for identical inputs; returns (job, created)."""
+        job_id = job_key(roster, programs, settings)
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is not None and job.status != 'failed':
+                self.jobs.move_to_end(job_id)
+                return job, False
+            pending = sum(1 for job in self.jobs.values() if job.status in ('queued', 'running'))
+            if pending >= self.max_pending:
+                raise OverflowError('too many jobs queued, try again later')
+            job = self.jobs[job_id] = Job(job_id, roster, programs, settings)
+            self._evict()
+        self.executor.submit(self._run, job)
+        return job, True
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def _evict(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in ('done', 'failed')]
+        # Oldest finished jobs first; queued and running jobs are never dropped
+        for job_id in finished[:max(0, len(self.jobs) - self.max_jobs)]:
+            del self.jobs[job_id]
+
+    def _run(self, job):
+        job.status = 'running'
+        try:
+            job.result, job.meetings, job.report = run_pipeline(
+                job.roster, job.programs, job.settings, self.cache
+            )
+        except Exception as exc:
+            job.error = str(exc) or type(exc).__name__
+            job.status = 'failed'
+        else:
+            job.status = 'done'
+        finally:
+            # The inputs are only needed to run the job
+            job.roster = job.programs = None
+
+def parse_settings(fields):
+    """Validate the form fields of a submission into the settings of a job."""
+    try:
+        settings = {
+            'strategy': fields.get('strategy', 'fair'),
+            'min_spacing': int(fields.get('min_spacing') or 0),
+            'max_per_month': int(fields['max_per_month']) if fields.get('max_per_month') else None,
+            'format': fields.get('format', 'xlsx'),
+        }
+    except ValueError as exc:
+        raise JobError(f'invalid number: {exc}') from None
+    if settings['strategy'] not in STRATEGIES:
+        raise JobError(f"unknown strategy: {settings['strategy']!r}")
+    if settings['format'] not in EXPORTERS:
+        raise JobError(f"unsupported format: {settings['format']!r}")
+    return settings
+
+def parse_form(content_type, body):
+    """Split a multipart/form-data body into ({field: text}, {field: [file bytes]})."""
+    if not content_type.startswith('multipart/form-data'):
+        raise JobError('expected a multipart/form-data upload')
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n' + body
+    )
+    fields, files = {}, collections.defaultdict(list)
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        payload = part.get_payload(decode=True) or b''
+        if part.get_filename() is not None:
+            files[name].append(payload)
+        else:
+            try:
+                fields[name] = payload.decode('utf-8').strip()
+            except UnicodeDecodeError:
+                raise JobError(f'form field {name!r} is not UTF-8 text') from None
+    return fields, files
+
+def parse_content_length(value):
+    """The body length a Content-Length header announces (0 if missing)."""
+    try:
+        length = int(value or 0)
+    except ValueError:
+        raise JobError(f'invalid Content-Length: {value!r}') from None
+    if length < 0:
+        raise JobError(f'invalid Content-Length: {value!r}')
+    return length
+
+class JobHandler(BaseHTTPRequestHandler):
+    server_version = 'modevaert'
+    # Set on the handler class by serve()
+    service = None
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/jobs':
+            return self._send_json(HTTPStatus.NOT_FOUND, {'error': 'not found'})
+        try:
+            length = parse_content_length(self.headers.get('Content-Length'))
+            if length > MAX_UPLOAD_BYTES:
+                return self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': 'upload too large'})
+            fields, files = parse_form(self.headers.get('Content-Type', ''), self.rfile.read(length))
+            if len(files['roster']) != 1 or not files['program']:
+                raise JobError("expected one 'roster' file and at least one 'program' file")
+            job, created = self.service.submit(files['roster'][0], files['program'], parse_settings(fields))
+        except JobError as exc:
+            return self._send_json(HTTPStatus.BAD_REQUEST, {'error': str(exc)})
+        except OverflowError as exc:
+            return self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {'error': str(exc)})
+        status = HTTPStatus.OK if job.status == 'done' else HTTPStatus.ACCEPTED
+        self._send_json(status, dict(job.describe(), cached=not created), location=f'/jobs/{job.id}')
+
+    def do_GET(self):
+        parts = self.path.strip('/').split('/')
+        job = self.service.get(parts[1]) if len(parts) in (2, 3) and parts[0] == 'jobs' else None
+        if job is None or (len(parts) == 3 and parts[2] != 'result'):
+            return self._send_json(HTTPStatus.NOT_FOUND, {'error': 'not found'})
+        if len(parts) == 2:
+            return self._send_json(HTTPStatus.OK, job.describe())
+        if job.status != 'done':
+            return self._send_json(HTTPStatus.CONFLICT, job.describe())
+        fmt = job.settings['format']
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', CONTENT_TYPES[fmt])
+        self.send_header('Content-Length', str(len(job.result)))
+        self.send_header('Content-Disposition', f'attachment; filename="modevart_tidsplan.{fmt}"')
+        self.end_headers()
+        self.wfile.write(job.result)
+
+    def _send_json(self, status, payload, location=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if location:
+            self.send_header('Location', location)
+        self.end_headers()
+        self.wfile.write(body)
+
+def serve(host='127.0.0.1', port=8765, service=None):
+    """Build the HTTP server around service (a default JobService if None); call serve_forever()."""
+    handler = type('BoundJobHandler', (JobHandler,), {'service': service or JobService()})
+    return ThreadingHTTPServer((host, port), handler)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m modevaert.service', description='Serve schedule generation jobs over HTTP.'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=8765, help='port to listen on (default: %(default)s)')
+    parser.add_argument(
+        '-w', '--workers', type=int, default=SERVICE_WORKERS,
+        help='number of jobs that run at the same time (default: %(default)s)'
+    )
+    parser.add_argument('--no-cache', action='store_true', help='do not use the page text cache')
+    args = parser.parse_args(argv)
+
+    service = JobService(args.workers, cache=None if args.no_cache else PageTextCache())
+    server = serve(args.host, args.port, service)
+    print(f'Serving on http://{args.host}:{server.server_address[1]}/jobs')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.executor.shutdown(wait=False, cancel_futures=True)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
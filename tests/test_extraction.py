@@ -0,0 +1,64 @@
+import os
+import sys
+
+from modevaert.backends import PdfiumBackend
+from modevaert.extraction import PageTextCache
+from modevaert.members import MemberMatcher
+from modevaert.program import parse_program_files
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import synthetic  # noqa: E402
+
+def test_cache_round_trip(tmp_path):
+    cache = PageTextCache(str(tmp_path), max_bytes=1000)
+    cache.put('a', ['side 1', 'side 2'])
+    assert cache.get('a') == ['side 1', 'side 2']
+    assert cache.get('b') is None
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = PageTextCache(str(tmp_path), max_bytes=60)
+    cache.put('a', ['x' * 20])
+    cache.put('b', ['y' * 20])
+    cache.get('a')
+    cache.put('c', ['z' * 20])
+    assert cache.get('a') == ['x' * 20]
+    assert cache.get('b') is None
+    assert cache.get('c') == ['z' * 20]
+
+def test_entry_larger_than_cap_is_not_stored_and_evicts_nothing(tmp_path):
+    cache = PageTextCache(str(tmp_path), max_bytes=60)
+    cache.put('a', ['x' * 20])
+    cache.put('big', ['y' * 100])
+    assert cache.get('big') is None
+    assert cache.get('a') == ['x' * 20]
+
+def synthetic_programs():
+    roster = synthetic.make_roster(40, seed=3)
+    members = [name for name, _note in roster]
+    programs = [synthetic.make_program(roster, weeks, seed=seed, filler_pages=1)
+                for seed, weeks in ((1, 14), (2, 30))]
+    return members, programs
+
+def parse_all(members, programs, backend):
+    return list(parse_program_files(programs, MemberMatcher(members), workers=1, backend=backend))
+
+def test_backends_find_the_same_meetings():
+    members, programs = synthetic_programs()
+    reference = parse_all(members, programs, 'pdfplumber')
+    assert all(reference)
+    assert parse_all(members, programs, 'pypdfium2') == reference
+    assert parse_all(members, programs, 'auto') == reference
+
+def test_auto_falls_back_to_pdfplumber(monkeypatch):
+    members, programs = synthetic_programs()
+    reference = parse_all(members, programs, 'pdfplumber')
+
+    # A text layer PDFium cannot read: blank pages, so the fast pass finds no meeting dates
+    def blank_pages(self, pdf_bytes, pages=None):
+        count = self.count_pages(pdf_bytes)
+        return iter([''] * (count if pages is None else len(pages)))
+
+    monkeypatch.setattr(PdfiumBackend, 'iter_page_texts', blank_pages)
+    assert parse_all(members, programs, 'pypdfium2') == [{}, {}]
+    assert parse_all(members, programs, 'auto') == reference
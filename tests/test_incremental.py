@@ -0,0 +1,35 @@
+import datetime
+
+from modevaert.fuzzy import FuzzyHit
+from modevaert.extraction import sqlite_connection
+from modevaert.incremental import ScheduleStore
+from modevaert.members import MemberMatcher
+from modevaert.meeting import WEEKDAY
+from modevaert.program import parse_program_lines
+
+def test_program_keeps_its_fuzzy_hits(tmp_path):
+    store = ScheduleStore(str(tmp_path))
+    meetings = {(datetime.date(2025, 9, 16), WEEKDAY): {'Jens Jensen'}}
+    store.put_program('a', meetings, {'Jens Jenssen': FuzzyHit('Jens Jensen', 0.917)})
+    assert store.get_program('a') == (meetings, {'Jens Jenssen': FuzzyHit('Jens Jensen', 0.917)})
+    assert store.get_program('b') is None
+
+def test_program_stored_without_fuzzy_hits_is_parsed_again(tmp_path):
+    store = ScheduleStore(str(tmp_path))
+    with sqlite_connection(store.path) as conn:
+        conn.execute(
+            'INSERT INTO programs VALUES (?, ?, ?)', ('a', '[["2025-09-16", "weekday", ["Jens Jensen"]]]', 0)
+        )
+    assert store.get_program('a') is None
+
+def test_fuzzy_hits_per_program():
+    matcher = MemberMatcher(['Jens Jensen', 'Søren Kierkegaard'])
+    first, second = {}, {}
+    parse_program_lines(['Tirsdag 15 September', 'Bøn: Jens Jenssen'], matcher, hits=first)
+    # A name matched earlier comes from the matcher's memo and still counts for this program
+    parse_program_lines(
+        ['Tirsdag 22 September', 'Bøn: Soren Kirkegaard', 'Oplæser: Jens Jenssen'], matcher, hits=second
+    )
+    assert set(first) == {'Jens Jenssen'}
+    assert set(second) == {'Soren Kirkegaard', 'Jens Jenssen'}
+    assert matcher.fuzzy_hits == {**first, **second}
@@ -0,0 +1,30 @@
+import datetime
+
+import pytest
+
+from modevaert.meeting import WEEKDAY, WEEKEND, Meeting
+from modevaert.parsing import tokenize_date_line
+
+D = datetime.date
+
+@pytest.mark.parametrize('meeting, label', [
+    (Meeting(D(2025, 9, 16), WEEKDAY), 'Tirsdag 16 September 2025'),
+    (Meeting(D(2025, 9, 7), WEEKEND), 'Søndag 07 September 2025'),
+    # The date's weekday contradicts the kind
+    (Meeting(D(2025, 9, 6), WEEKDAY), 'Tirsdag 06 September 2025'),
+    (Meeting(D(2025, 9, 10), WEEKEND), 'Søndag 10 September 2025'),
+])
+def test_label_round_trip_keeps_kind(meeting, label):
+    assert meeting.label == label
+    assert Meeting.from_label(label) == meeting
+
+def test_assumed_year_on_a_saturday_stays_a_weekday_meeting():
+    # "Tirsdag 06 September" gets the year 2025, in which 6 September is a Saturday
+    header = tokenize_date_line('Tirsdag 06 September')
+    meeting = Meeting(header.date, header.kind)
+    assert Meeting.from_label(meeting.label).kind == WEEKDAY
+
+@pytest.mark.parametrize('label', ['Tirsdag 31 Februar 2026', 'Tirsdag 06 Sept 2025', None, 'Dato'])
+def test_not_a_label(label):
+    with pytest.raises(ValueError):
+        Meeting.from_label(label)
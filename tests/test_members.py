@@ -0,0 +1,100 @@
+import io
+import random
+import re
+import zipfile
+
+import openpyxl
+import pytest
+
+from modevaert.members import MemberMatcher, find_matching_member, normalize_name, parse_members
+
+def reference_match(pdf_name, members_list):
+    """The original linear scan: exact, then partial, then a shared word of more than two letters."""
+    normalized_pdf_name = normalize_name(pdf_name)
+    for member in members_list:
+        if normalize_name(member) == normalized_pdf_name:
+            return member
+    for member in members_list:
+        normalized_member = normalize_name(member)
+        if normalized_member in normalized_pdf_name or normalized_pdf_name in normalized_member:
+            return member
+    pdf_words = normalized_pdf_name.split()
+    for member in members_list:
+        for member_word in normalize_name(member).split():
+            if len(member_word) > 2 and member_word in pdf_words:
+                return member
+    return None
+
+FIRST = ['Jens', 'Marie', 'Anne', 'Lars', 'Ole', 'Bo', 'Mette', 'Michael', 'Ib']
+LAST = ['Hansen', 'Jensen', 'Nielsen', 'Keler', 'Vollenberg', 'Ale', 'Sen', 'Han']
+
+def random_name(rng):
+    words = [rng.choice(FIRST)] + [rng.choice(LAST) for _ in range(rng.randint(0, 2))]
+    name = ' '.join(words)
+    if rng.random() < 0.3:
+        name = name.upper() if rng.random() < 0.5 else name.lower()
+    if rng.random() < 0.2:
+        name = name.replace(' ', '  ')
+    return name
+
+@pytest.mark.parametrize('seed', range(20))
+def test_matcher_agrees_with_reference(seed):
+    rng = random.Random(seed)
+    # Duplicates and names contained in other names exercise the tie-breaking by roster order
+    members = [random_name(rng) for _ in range(rng.randint(1, 25))]
+    matcher = MemberMatcher(members, fuzzy_min_score=1)
+    for _ in range(200):
+        pdf_name = random_name(rng) if rng.random() < 0.8 else rng.choice(members)
+        assert matcher.match(pdf_name) == reference_match(pdf_name, members), (pdf_name, members)
+
+@pytest.mark.parametrize('score', [0, -0.5, 1.5, 'abc'])
+def test_fuzzy_min_score_out_of_range(score):
+    with pytest.raises(ValueError, match='above 0 and at most 1'):
+        MemberMatcher(['Jens Jensen'], fuzzy_min_score=score)
+
+@pytest.mark.parametrize('pdf_name, expected', [
+    ('Michael Keler', 'Michael Keler'),
+    ('michael   KELER', 'Michael Keler'),
+    # A member contained in the PDF name, and the PDF name contained in a member
+    ('Michael Vollenberg Keler Jr', 'Michael Vollenberg Keler'),
+    ('Vollenberg', 'Michael Vollenberg Keler'),
+    # The first member sharing a last name wins
+    ('Anne Keler', 'Michael Keler'),
+    ('Bo Ib', None),
+])
+def test_matcher_steps(pdf_name, expected):
+    members = ['Michael Keler', 'Michael Vollenberg Keler', 'Marie Jensen']
+    assert MemberMatcher(members, fuzzy_min_score=1).match(pdf_name) == expected
+    assert find_matching_member(pdf_name, members) == expected
+
+
+def test_diacritics_and_misspellings():
+    members = ['Hans Rüdinger', 'Søren Kierkegaard', 'Jens Hansen', 'Jens Jensen']
+    matcher = MemberMatcher(members)
+    assert matcher.match('Hans Rudinger') == 'Hans Rüdinger'
+    assert matcher.match('Soren Kirkegaard') == 'Søren Kierkegaard'
+    assert matcher.match('Jens Jenssen') == 'Jens Jensen'
+    assert set(matcher.fuzzy_hits) == {'Soren Kirkegaard', 'Jens Jenssen'}
+
+def test_xlsx_roster_with_stale_dimension():
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(['Mødevært', 'Note'])
+    sheet.append([None, None])
+    sheet.append(['Jens Hansen', None])
+    sheet.append(['Marie Jensen', 'Sunday only'])
+    written = io.BytesIO()
+    workbook.save(written)
+
+    # Rewrite the sheet's <dimension ref> to A1, as some writers leave it
+    stale = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(written.getvalue())) as source, zipfile.ZipFile(stale, 'w') as target:
+        for item in source.infolist():
+            content = source.read(item.filename)
+            if item.filename == 'xl/worksheets/sheet1.xml':
+                content = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="A1"', content)
+            target.writestr(item, content)
+
+    assert parse_members(io.BytesIO(stale.getvalue())) == (
+        ['Jens Hansen', 'Marie Jensen'], {'Marie Jensen': 'sunday_only'}
+    )
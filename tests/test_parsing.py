@@ -0,0 +1,62 @@
+import datetime
+
+import pytest
+
+from modevaert.meeting import WEEKDAY, WEEKEND
+from modevaert.parsing import DateHeader, extract_candidate_names, tokenize_date_line
+
+D = datetime.date
+
+@pytest.mark.parametrize('line, expected', [
+    # Cross-month range: the Tuesday and Sunday of the week, across the month boundary
+    ('Marts 30-april 05', DateHeader(WEEKDAY, D(2026, 3, 31), D(2026, 4, 5), False)),
+    # Single-month range
+    ('marts 02-08', DateHeader(WEEKDAY, D(2026, 3, 3), D(2026, 3, 8), False)),
+    ('MARTS 02-08 Ingen møde', DateHeader(WEEKDAY, D(2026, 3, 3), D(2026, 3, 8), True)),
+    ('marts 02-08 Intet møde', DateHeader(WEEKDAY, D(2026, 3, 3), D(2026, 3, 8), True)),
+    # Weekday header at the start of the line
+    ('Tirsdag 15 September', DateHeader(WEEKDAY, D(2025, 9, 15), None, False)),
+    ('Torsdag 02 Oktober Ingen møde', DateHeader(WEEKDAY, D(2025, 10, 2), None, True)),
+    # Weekend date at the start of the line
+    ('07/09/2025', DateHeader(WEEKEND, D(2025, 9, 7), None, False)),
+    ('31/02/2025', DateHeader(WEEKEND, None, None, False)),
+    # January workbook header
+    ('06. JAN | UGENS BIBELLÆSNING', DateHeader(WEEKDAY, D(2026, 1, 6), None, False)),
+    # Full month name; January is the next year
+    ('01. Januar 26', DateHeader(WEEKDAY, D(2026, 1, 1), None, False)),
+    ('Uge 15 September', DateHeader(WEEKDAY, D(2025, 9, 15), None, False)),
+    # Abbreviated month; January to March are the next year
+    ('03. FEB', DateHeader(WEEKDAY, D(2026, 2, 3), None, False)),
+    ('10 okt', DateHeader(WEEKDAY, D(2025, 10, 10), None, False)),
+    ('31. FEB', DateHeader(WEEKDAY, None, None, False)),
+])
+def test_date_formats(line, expected):
+    assert tokenize_date_line(line) == expected
+
+@pytest.mark.parametrize('line', ['', 'Sang 12', 'Bibelstudium', 'Bøn: Marcel Ale', 'Tirsdag 5 September'])
+def test_lines_without_date(line):
+    assert tokenize_date_line(line) is None
+
+@pytest.mark.parametrize('line, expected', [
+    # cross > range
+    ('marts 02-08 Marts 30-april 05', DateHeader(WEEKDAY, D(2026, 3, 31), D(2026, 4, 5), False)),
+    # range > weekday
+    ('Mandag 02 Marts marts 02-08', DateHeader(WEEKDAY, D(2026, 3, 3), D(2026, 3, 8), False)),
+    # weekday > danish: the weekday header keeps January in 2025
+    ('Tirsdag 06 Januar', DateHeader(WEEKDAY, D(2025, 1, 6), None, False)),
+    # weekend > danish
+    ('07/09/2025 15 September', DateHeader(WEEKEND, D(2025, 9, 7), None, False)),
+    # january > danish
+    ('06. JAN 10 Februar', DateHeader(WEEKDAY, D(2026, 1, 6), None, False)),
+    # danish > abbrev, even when the abbreviation comes first
+    ('03. FEB 10 Oktober', DateHeader(WEEKDAY, D(2025, 10, 10), None, False)),
+])
+def test_date_format_precedence(line, expected):
+    assert tokenize_date_line(line) == expected
+
+def test_candidate_name_contexts():
+    assert extract_candidate_names('Bøn: Marcel Ale') == [('Marcel Ale', 'colon')]
+    assert extract_candidate_names('Oplæser (Jens Hansen)') == [('Jens Hansen', 'paren')]
+    assert extract_candidate_names('Christopher Rasmussen/Lucas Vinzentsen') == [
+        ('Christopher Rasmussen', 'slash'), ('Lucas Vinzentsen', 'slash')
+    ]
@@ -0,0 +1,43 @@
+import collections
+import datetime
+
+import pytest
+
+from modevaert.ledger import HostingHistory
+from modevaert.meeting import WEEKDAY, Meeting
+from modevaert.schedule import HISTORY_MAX_LAG, NO_HOST, SchedulingConstraints, generate_schedule
+
+@pytest.mark.parametrize('strategy', ['round_robin', 'fair'])
+def test_meeting_without_hosts_does_not_count(strategy):
+    # B and C are busy on the first meeting, so it gets no hosts; A's monthly cap must stay free
+    first = Meeting(datetime.date(2025, 9, 2), WEEKDAY, {'B', 'C'})
+    second = Meeting(datetime.date(2025, 9, 9), WEEKDAY, {'C'})
+    schedule = generate_schedule(
+        ['A', 'B', 'C'], [first, second], strategy=strategy,
+        constraints=SchedulingConstraints(max_per_month=1)
+    )
+    assert schedule[first] == (NO_HOST, NO_HOST)
+    assert set(schedule[second]) == {'A', 'B'}
+
+def test_round_robin_never_picks_one_member_twice():
+    meeting = Meeting(datetime.date(2025, 9, 2), WEEKDAY, {'B'})
+    assert generate_schedule(['A', 'B'], [meeting], strategy='round_robin')[meeting] == (NO_HOST, NO_HOST)
+
+def test_newcomer_does_not_host_every_meeting():
+    members = ['A', 'B', 'C', 'D', 'E']
+    history = HostingHistory(
+        {member: datetime.date(2025, 8, 26) for member in 'ABCD'}, dict.fromkeys('ABCD', 10)
+    )
+    meetings = [Meeting(datetime.date(2025, 9, 2) + datetime.timedelta(weeks=week), WEEKDAY, set())
+                for week in range(8)]
+    schedule = generate_schedule(members, meetings, history=history)
+    hostings = collections.Counter(member for hosts in schedule.values() for member in hosts)
+    # E starts HISTORY_MAX_LAG hostings behind and then takes turns with the others
+    assert hostings['E'] < len(meetings)
+    assert max(hostings.values()) - min(hostings.values()) <= HISTORY_MAX_LAG + 1
+    assert hostings['E'] == max(hostings.values())
+
+def test_history_within_the_lag_is_kept():
+    history = HostingHistory({'A': datetime.date(2025, 8, 26)}, {'A': 1})
+    meeting = Meeting(datetime.date(2025, 9, 2), WEEKDAY, set())
+    assert set(generate_schedule(['A', 'B', 'C'], [meeting], history=history)[meeting]) == {'B', 'C'}
@@ -0,0 +1,49 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from modevaert.service import JobService, serve
+
+@pytest.fixture
+def server():
+    service = JobService(workers=1)
+    httpd = serve(port=0, service=service)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    httpd.server_close()
+    service.executor.shutdown(wait=False)
+
+def post(address, body, headers):
+    connection = http.client.HTTPConnection(*address, timeout=10)
+    try:
+        connection.putrequest('POST', '/jobs')
+        for name, value in headers.items():
+            connection.putheader(name, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+@pytest.mark.parametrize('length', ['abc', '-1'])
+def test_invalid_content_length(server, length):
+    status, reply = post(server, b'', {
+        'Content-Type': 'multipart/form-data; boundary=x', 'Content-Length': length
+    })
+    assert status == 400
+    assert 'Content-Length' in reply['error']
+
+def test_form_field_that_is_not_utf8(server):
+    body = (
+        b'--x\r\nContent-Disposition: form-data; name="strategy"\r\n\r\nf\xe6r\r\n'
+        b'--x\r\nContent-Disposition: form-data; name="roster"; filename="r.csv"\r\n\r\nA\r\n--x--\r\n'
+    )
+    status, reply = post(server, body, {
+        'Content-Type': 'multipart/form-data; boundary=x', 'Content-Length': str(len(body))
+    })
+    assert status == 400
+    assert 'strategy' in reply['error']